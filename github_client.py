@@ -0,0 +1,54 @@
+"""Shared GitHub API client for the repository's setup scripts.
+
+All calls go through one pooled, retrying HTTPS session and payloads are
+serialized with orjson, so every script gets connection reuse and the same
+retry policy without building its own headers or session.
+"""
+
+import os
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# GitHub API base URL
+GITHUB_API_URL = 'https://api.github.com'
+GRAPHQL_URL = f'{GITHUB_API_URL}/graphql'
+
+_session = None
+
+def _get_session():
+    """Returns the shared session, creating it on first use.
+
+    Created lazily so callers can load GITHUB_TOKEN (e.g. from .env) after import.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update({
+            'Authorization': f"token {os.getenv('GITHUB_TOKEN')}",
+            'Accept': 'application/vnd.github.v3+json',
+            'X-GitHub-Api-Version': '2022-11-28', # Required for Projects (beta) API
+            'Content-Type': 'application/json' # Payloads are pre-serialized with orjson
+        })
+        _session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        ))
+    return _session
+
+def rest(method, path, **kwargs) -> requests.Response:
+    """Sends a REST request; path is relative to GITHUB_API_URL (e.g. '/users/octocat')."""
+    return _get_session().request(method, f'{GITHUB_API_URL}{path}', **kwargs)
+
+def graphql(query: str, variables: dict) -> dict:
+    """Runs a GraphQL query or mutation and returns the decoded response body.
+
+    GraphQL-level failures are reported in the body's 'errors' key; HTTP-level
+    failures raise requests.HTTPError.
+    """
+    payload = {'query': query, 'variables': variables}
+    response = _get_session().post(GRAPHQL_URL, data=orjson.dumps(payload))
+    response.raise_for_status()
+    return orjson.loads(response.content)
@@ -1,51 +1,88 @@
+import asyncio
 import os
+import orjson
 import requests
-import json
 from dotenv import load_dotenv
+from github_client import graphql
 
 # Configuration
 load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))  # Load environment variables from .env file
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN') # Make sure to set this environment variable
 GITHUB_ORG_USER = 'kit678' # Replace with your GitHub organization or username
 
-# GitHub API base URL
-GITHUB_API_URL = 'https://api.github.com'
+# Cached Node ID of GITHUB_ORG_USER, resolved once by get_owner_id()
+OWNER_ID = None
 
-# Headers for API requests
-HEADERS = {
-    'Authorization': f'token {GITHUB_TOKEN}',
-    'Accept': 'application/vnd.github.v3+json',
-    'X-GitHub-Api-Version': '2022-11-28' # Required for Projects (beta) API
-}
+# Owner Node IDs never change, so they are also persisted across runs
+OWNER_CACHE_FILE = os.path.join(os.path.dirname(__file__), '.github_boards_cache.json')
 
-def create_github_project(project_name, project_description):
-    """Creates a new GitHub Project (v2)."""
-    # To create a project, you need the Node ID of the owner (organization or user)
-    # First, get the owner's Node ID
-    owner_id = None
-    # Try fetching as a user first
-    user_url = f'{GITHUB_API_URL}/users/{GITHUB_ORG_USER}'
-    response = requests.get(user_url, headers=HEADERS)
-    if response.status_code == 200:
-        owner_id = response.json().get('node_id')
-    elif response.status_code == 404:
-        # If not a user, try fetching as an organization
-        org_url = f'{GITHUB_API_URL}/orgs/{GITHUB_ORG_USER}'
-        response = requests.get(org_url, headers=HEADERS)
-        if response.status_code == 200:
-            owner_id = response.json().get('node_id')
-    
-    if response.status_code != 200:
-        print(f"Error fetching owner ID: {response.status_code} - {response.json()}")
+def _load_owner_cache():
+    """Loads the login -> Node ID cache from disk."""
+    try:
+        with open(OWNER_CACHE_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+
+def _save_owner_cache(cache):
+    """Writes the login -> Node ID cache to disk."""
+    with open(OWNER_CACHE_FILE, 'wb') as f:
+        f.write(orjson.dumps(cache))
+
+def forget_owner_id():
+    """Drops the cached Node ID of GITHUB_ORG_USER, e.g. after a 401/404."""
+    global OWNER_ID
+    OWNER_ID = None
+    cache = _load_owner_cache()
+    if cache.pop(GITHUB_ORG_USER, None) is not None:
+        _save_owner_cache(cache)
+
+def get_owner_id():
+    """Resolves the Node ID of the owner (user or organization) in one GraphQL query."""
+    global OWNER_ID
+    if OWNER_ID:
+        return OWNER_ID
+
+    cache = _load_owner_cache()
+    if cache.get(GITHUB_ORG_USER):
+        OWNER_ID = cache[GITHUB_ORG_USER]
+        print(f"Using cached owner ID for '{GITHUB_ORG_USER}' (ID: {OWNER_ID})")
+        return OWNER_ID
+
+    # repositoryOwner resolves both users and organizations
+    query = """
+    query GetOwner($login: String!) {
+      repositoryOwner(login: $login) {
+        id
+        __typename
+      }
+    }
+    """
+    variables = {'login': GITHUB_ORG_USER}
+
+    try:
+        data = graphql(query, variables)
+    except requests.HTTPError as e:
+        print(f"Error fetching owner ID: {e.response.status_code} - {e.response.text}")
         return None
 
-    if not owner_id:
+    if 'errors' in data:
+        print(f"GraphQL Errors fetching owner ID: {data['errors']}")
+        return None
+
+    owner = data['data']['repositoryOwner']
+    if not owner:
         print("Could not retrieve owner Node ID.")
         return None
 
-    # GraphQL endpoint for Projects (v2) API
-    graphql_url = f'{GITHUB_API_URL}/graphql'
+    print(f"Resolved {owner['__typename']} '{GITHUB_ORG_USER}' (ID: {owner['id']})")
+    OWNER_ID = owner['id']
+    cache[GITHUB_ORG_USER] = OWNER_ID
+    _save_owner_cache(cache)
+    return OWNER_ID
 
+def create_github_project(project_name, project_description, owner_id):
+    """Creates a new GitHub Project (v2)."""
     # GraphQL mutation to create a project
     query = """
     mutation CreateProject($ownerId: ID!, $title: String!) {
@@ -63,27 +100,27 @@ def create_github_project(project_name, project_description):
         'title': project_name
     }
 
-    payload = {'query': query, 'variables': variables}
-
     print(f"Attempting to create project: {project_name}")
-    response = requests.post(graphql_url, headers=HEADERS, data=json.dumps(payload))
-
-    if response.status_code == 200:
-        data = response.json()
-        if 'errors' in data:
-            print(f"GraphQL Errors: {data['errors']}")
-            return None
-        project = data['data']['createProjectV2']['projectV2']
-        print(f"Successfully created project: {project['title']} (ID: {project['id']}) - {project['url']}")
-        return project
-    else:
-        print(f"Error creating project: {response.status_code} - {response.json()}")
+    try:
+        data = graphql(query, variables)
+    except requests.HTTPError as e:
+        print(f"Error creating project: {e.response.status_code} - {e.response.text}")
+        if e.response.status_code in (401, 404):
+            forget_owner_id()
         return None
 
+    if 'errors' in data:
+        print(f"GraphQL Errors: {data['errors']}")
+        # A stale cached owner ID no longer resolves to a node
+        if any(error.get('type') == 'NOT_FOUND' for error in data['errors']):
+            forget_owner_id()
+        return None
+    project = data['data']['createProjectV2']['projectV2']
+    print(f"Successfully created project: {project['title']} (ID: {project['id']}) - {project['url']}")
+    return project
+
 def create_project_field(project_id, field_name, field_type, owner_id):
     """Creates a custom field for a given project."""
-    graphql_url = f'{GITHUB_API_URL}/graphql'
-
     # GraphQL mutation to create a custom field
     query = """
     mutation CreateProjectV2Field($projectId: ID!, $name: String!, $dataType: ProjectV2CustomFieldType!) {
@@ -115,61 +152,87 @@ def create_project_field(project_id, field_name, field_type, owner_id):
         'dataType': field_type
     }
 
-    payload = {'query': query, 'variables': variables}
-
     print(f"Attempting to create field '{field_name}' for project ID: {project_id}")
-    response = requests.post(graphql_url, headers=HEADERS, data=json.dumps(payload))
-
-    if response.status_code == 200:
-        data = response.json()
-        if 'errors' in data:
-            print(f"GraphQL Errors creating field: {data['errors']}")
-            return None
-        field = data['data']['createProjectV2Field']['projectV2Field']
-        print(f"Successfully created field: {field['name']} (ID: {field['id']})")
-        return field
-    else:
-        print(f"Error creating field: {response.status_code} - {response.json()}")
+    try:
+        data = graphql(query, variables)
+    except requests.HTTPError as e:
+        print(f"Error creating field: {e.response.status_code} - {e.response.text}")
         return None
 
-def create_single_select_field_option(field_id, project_id, name):
-    """Adds an option to a single-select custom field."""
-    graphql_url = f'{GITHUB_API_URL}/graphql'
+    if 'errors' in data:
+        print(f"GraphQL Errors creating field: {data['errors']}")
+        return None
+    field = data['data']['createProjectV2Field']['projectV2Field']
+    print(f"Successfully created field: {field['name']} (ID: {field['id']})")
+    return field
 
-    query = """
-    mutation CreateProjectV2SingleSelectFieldOption($fieldId: ID!, $projectId: ID!, $name: String!) {
-      createProjectV2SingleSelectFieldOption(input: {fieldId: $fieldId, projectId: $projectId, name: $name}) {
-        projectV2SingleSelectFieldOption {
+def create_single_select_field_options(field_id, project_id, names):
+    """Adds several options to a single-select custom field in one request."""
+    # One aliased mutation per option, all sent in a single GraphQL document
+    params = ''.join(f', $name{i}: String!' for i in range(len(names)))
+    fields = ''.join(f"""
+      opt{i}: createProjectV2SingleSelectFieldOption(input: {{fieldId: $fieldId, projectId: $projectId, name: $name{i}}}) {{
+        projectV2SingleSelectFieldOption {{
           id
           name
-        }
-      }
-    }
+        }}
+      }}""" for i in range(len(names)))
+    query = f"""
+    mutation CreateProjectV2SingleSelectFieldOptions($fieldId: ID!, $projectId: ID!{params}) {{{fields}
+    }}
     """
     variables = {
         'fieldId': field_id,
-        'projectId': project_id,
-        'name': name
+        'projectId': project_id
     }
+    variables.update({f'name{i}': name for i, name in enumerate(names)})
 
-    payload = {'query': query, 'variables': variables}
-
-    print(f"Attempting to add option '{name}' to field ID: {field_id}")
-    response = requests.post(graphql_url, headers=HEADERS, data=json.dumps(payload))
+    print(f"Attempting to add options {names} to field ID: {field_id}")
+    try:
+        data = graphql(query, variables)
+    except requests.HTTPError as e:
+        print(f"Error adding options: {e.response.status_code} - {e.response.text}")
+        return None
 
-    if response.status_code == 200:
-        data = response.json()
-        if 'errors' in data:
-            print(f"GraphQL Errors adding option: {data['errors']}")
-            return None
-        option = data['data']['createProjectV2SingleSelectFieldOption']['projectV2SingleSelectFieldOption']
-        print(f"Successfully added option: {option['name']} (ID: {option['id']})")
-        return option
-    else:
-        print(f"Error adding option: {response.status_code} - {response.json()}")
+    if 'errors' in data:
+        print(f"GraphQL Errors adding options: {data['errors']}")
         return None
+    options = []
+    for i in range(len(names)):
+        option = data['data'][f'opt{i}']['projectV2SingleSelectFieldOption']
+        print(f"Successfully added option: {option['name']} (ID: {option['id']})")
+        options.append(option)
+    return options
+
+async def setup_main_dev_board(owner_id):
+    """Creates the Main Development Board and its 'Status' field."""
+    main_dev_board = await asyncio.to_thread(
+        create_github_project,
+        "Main Development Board",
+        "Central board for tracking all development tasks and progress.",
+        owner_id
+    )
+
+    if main_dev_board:
+        print("Configuring custom fields for Main Development Board...")
+        # Create 'Status' field (Single Select); its options depend on the field ID.
+        # Only the options are batched into one request: the project, the field
+        # and the options are still three sequential round trips.
+        status_field = await asyncio.to_thread(
+            create_project_field, main_dev_board['id'], "Status", "SINGLE_SELECT", owner_id
+        )
+        if status_field:
+            # Add options to 'Status' field
+            await asyncio.to_thread(
+                create_single_select_field_options,
+                status_field['id'],
+                main_dev_board['id'],
+                ["Todo", "In Progress", "Done", "Blocked"]
+            )
+
+    return main_dev_board
 
-def main():
+async def main():
     if not GITHUB_TOKEN:
         print("Error: GITHUB_TOKEN environment variable not set.")
         print("Please set it before running the script: export GITHUB_TOKEN='your_token'")
@@ -179,49 +242,23 @@ def main():
         print("Error: Please replace 'your_github_org_or_username' with your actual GitHub organization or username.")
         return
 
-    # Get the owner's Node ID for creating custom fields
-    owner_id = None
-    user_url = f'{GITHUB_API_URL}/users/{GITHUB_ORG_USER}'
-    response = requests.get(user_url, headers=HEADERS)
-    if response.status_code == 200:
-        owner_id = response.json().get('node_id')
-    elif response.status_code == 404:
-        org_url = f'{GITHUB_API_URL}/orgs/{GITHUB_ORG_USER}'
-        response = requests.get(org_url, headers=HEADERS)
-        if response.status_code == 200:
-            owner_id = response.json().get('node_id')
-
-    if response.status_code != 200:
-        print(f"Error fetching owner ID: {response.status_code} - {response.json()}")
-        return
-
+    # Get the owner's Node ID for creating projects and custom fields
+    owner_id = get_owner_id()
     if not owner_id:
-        print("Could not retrieve owner Node ID.")
         return
 
     print("Starting GitHub Project setup...")
 
-    # Create Main Development Board
-    main_dev_board = create_github_project(
-        "Main Development Board",
-        "Central board for tracking all development tasks and progress."
-    )
-
-    if main_dev_board:
-        print("Configuring custom fields for Main Development Board...")
-        # Create 'Status' field (Single Select)
-        status_field = create_project_field(main_dev_board['id'], "Status", "SINGLE_SELECT", owner_id)
-        if status_field:
-            # Add options to 'Status' field
-            create_single_select_field_option(status_field['id'], main_dev_board['id'], "Todo")
-            create_single_select_field_option(status_field['id'], main_dev_board['id'], "In Progress")
-            create_single_select_field_option(status_field['id'], main_dev_board['id'], "Done")
-            create_single_select_field_option(status_field['id'], main_dev_board['id'], "Blocked")
-
-    # Create Release Planning Board
-    release_planning_board = create_github_project(
-        "Release Planning Board",
-        "Board for planning and tracking tasks related to specific releases."
+    # The two boards are independent, so set them up concurrently. The blocking
+    # helpers run in worker threads and share github_client's connection pool.
+    main_dev_board, release_planning_board = await asyncio.gather(
+        setup_main_dev_board(owner_id),
+        asyncio.to_thread(
+            create_github_project,
+            "Release Planning Board",
+            "Board for planning and tracking tasks related to specific releases.",
+            owner_id
+        )
     )
 
     print("\nGitHub Project setup complete.")
@@ -229,4 +266,4 @@ def main():
         print("You may need to manually configure custom fields, views, and automation rules via the GitHub UI or further API calls.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -30,14 +30,15 @@ class TestFrameCollector(FrameProcessor):
         self.frames = []
     
     async def process_frame(self, frame, direction=FrameDirection.DOWNSTREAM):
-        logger.info(f"TestFrameCollector received frame: {type(frame).__name__}")
+        # Pass arguments instead of f-strings so loguru only formats when INFO is enabled
+        logger.info("TestFrameCollector received frame: {}", type(frame).__name__)
         await super().process_frame(frame, direction)
         self.frames.append(frame)
-        logger.info(f"Collected frame: {type(frame).__name__} (total: {len(self.frames)})")
+        logger.info("Collected frame: {} (total: {})", type(frame).__name__, len(self.frames))
         if hasattr(frame, 'intent'):
-            logger.info(f"  Intent: {frame.intent}")
-            logger.info(f"  Parameters: {frame.parameters}")
-            logger.info(f"  Confidence: {frame.confidence}")
+            logger.info("  Intent: {}", frame.intent)
+            logger.info("  Parameters: {}", frame.parameters)
+            logger.info("  Confidence: {}", frame.confidence)
 
 async def test_llm_intent_parser():
     """Test the LLM-based intent parser with various inputs"""
@@ -69,15 +70,18 @@ async def test_llm_intent_parser():
     
     logger.info(f"Testing {len(test_inputs)} different inputs...")
     
-    for i, text in enumerate(test_inputs, 1):
-        logger.info(f"\n--- Test {i}: '{text}' ---")
+    # Create all transcription frames up front
+    frames = [TranscriptionFrame(text, "user_id", timestamp=None) for text in test_inputs]
+    
+    # Inputs run one at a time: frames reach the collector from the pipeline,
+    # not from the caller's task, so only the order of collection tells which
+    # input produced them
+    for i, (text, frame) in enumerate(zip(test_inputs, frames), 1):
+        logger.info("\n--- Test {}: '{}' ---", i, text)
         
         # Clear previous frames
         initial_frame_count = len(collector.frames)
         
-        # Create a transcription frame
-        frame = TranscriptionFrame(text, "user_id", timestamp=None)
-        
         # Process the frame
         try:
             await intent_parser.process_frame(frame, FrameDirection.DOWNSTREAM)
@@ -504,6 +504,7 @@ async function startGoogleAuthFlow() {
     const pythonScript = `
 import sys
 import os
+import asyncio
 from pathlib import Path
 
 # Add project root to path
@@ -514,7 +515,8 @@ from src.auth.google_oauth import GoogleOAuthManager
 
 try:
     oauth_manager = GoogleOAuthManager()
-    auth_url = oauth_manager.initialize_flow(['tasks', 'calendar', 'drive', 'docs'])
+    # Stores the flow state so the script that receives the code can finish it
+    auth_url = asyncio.run(oauth_manager.get_authorization_url(['tasks', 'calendar', 'drive', 'docs']))
     print(f'AUTH_URL:{auth_url}')
 except Exception as e:
     print(f'ERROR: {e}')
@@ -579,7 +581,7 @@ from src.auth.google_oauth import GoogleOAuthManager
 async def complete_auth():
     try:
         oauth_manager = GoogleOAuthManager()
-        oauth_manager.initialize_flow(['tasks', 'calendar', 'drive', 'docs'])
+        # Restores the flow started by startGoogleAuthFlow
         success = await oauth_manager.handle_callback('${authCode}')
         if success:
             print('AUTH_SUCCESS')
@@ -928,7 +930,7 @@ from src.auth.google_oauth import GoogleOAuthManager
 async def complete_auth():
     try:
         oauth_manager = GoogleOAuthManager()
-        oauth_manager.initialize_flow(['tasks', 'calendar', 'drive', 'docs'])
+        # Restores the flow started by startGoogleAuthFlow
         success = await oauth_manager.handle_callback('${authCode}')
         if success:
             print('AUTH_SUCCESS')
@@ -7,11 +7,18 @@ It creates necessary directories, templates, and validates the setup.
 """
 
 import os
+import copy
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 import re
 
+from dotenv import dotenv_values
+
+# Placeholder prefix used by the client secrets template
+_TEMPLATE_RE = re.compile(r'YOUR_')
+
 def create_credentials_directory():
     """Create the credentials directory with proper .gitignore."""
     credentials_dir = Path('credentials')
@@ -78,18 +85,14 @@ ENVIRONMENT=development
 
 def parse_env_file(env_path: Path) -> Dict[str, str]:
     """Parse .env file and return key-value pairs."""
-    env_vars = {}
-    if env_path.exists():
-        try:
-            with open(env_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip()
-        except Exception as e:
-            print(f"Warning: Could not parse .env file: {e}")
-    return env_vars
+    if not env_path.exists():
+        return {}
+    try:
+        # Same parser as load_dotenv elsewhere in the project; keys without a value are skipped
+        return {key: value for key, value in dotenv_values(env_path).items() if value is not None}
+    except Exception as e:
+        print(f"Warning: Could not parse .env file: {e}")
+        return {}
 
 def check_existing_setup():
     """Check if OAuth setup already exists."""
@@ -116,16 +119,24 @@ def check_existing_setup():
     
     return status
 
+@lru_cache(maxsize=None)
+def _load_secrets(path: str, mtime: float) -> Dict[str, Any]:
+    """Load and parse a client secrets file; cached per (path, mtime)."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
 def validate_client_secrets(file_path: Path) -> Dict[str, Any]:
     """Validate the client secrets file format."""
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        file_path = Path(file_path)
+        
+        # Copy, so callers can't change the cached parse
+        data = copy.deepcopy(_load_secrets(str(file_path), file_path.stat().st_mtime))
         
         required_fields = ['client_id', 'client_secret', 'project_id']
         web_config = data.get('web', {})
         
-        missing_fields = [field for field in required_fields if not web_config.get(field) or web_config.get(field).startswith('YOUR_')]
+        missing_fields = [field for field in required_fields if not web_config.get(field) or _TEMPLATE_RE.match(web_config.get(field))]
         
         return {
             'valid': len(missing_fields) == 0,
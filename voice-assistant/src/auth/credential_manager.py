@@ -1,12 +1,103 @@
 import os
-import json
+import copy
+import orjson
+import shutil
+import stat
+import tempfile
+import threading
+import time
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from cryptography.fernet import Fernet
 from loguru import logger
 import base64
 import hashlib
 
+# Optional Rust Fernet implementation (same token format as cryptography's Fernet).
+# Set VOICE_ASSISTANT_DISABLE_RFERNET=1 to force the cryptography implementation.
+_rfernet = None
+if os.getenv('VOICE_ASSISTANT_DISABLE_RFERNET', '').lower() not in ('1', 'true', 'yes'):
+    try:
+        import rfernet as _rfernet
+    except ImportError:
+        _rfernet = None
+
+
+def _create_cipher(key: bytes):
+    """Create a Fernet cipher, preferring rfernet when it is available.
+    
+    Args:
+        key: URL-safe base64-encoded Fernet key
+        
+    Returns:
+        Cipher exposing encrypt(bytes) -> bytes and decrypt(bytes) -> bytes
+    """
+    if _rfernet is not None:
+        return _rfernet.Fernet(key.decode())
+    return Fernet(key)
+
+
+def _write_private_file(file_path: str, data: bytes) -> None:
+    """Atomically write data to a file readable and writable by the owner only.
+    
+    Data is written and fsynced to a uniquely named temporary file, created
+    owner-only by mkstemp, that then replaces the target; on POSIX the
+    directory is fsynced too so the rename survives a crash. Concurrent
+    writers, in this process or another, never share a temporary file.
+    
+    Args:
+        file_path: Destination file path
+        data: Bytes to write
+    """
+    directory = os.path.dirname(file_path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(file_path) + '.', suffix='.tmp', dir=directory)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if os.name == 'nt':
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IWUSR)
+        
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    
+    if os.name != 'nt':
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _read_private_file(file_path: str) -> Tuple[bytes, float]:
+    """Read a whole file with a single unbuffered read.
+    
+    Args:
+        file_path: File to read
+        
+    Returns:
+        Tuple of (file contents, file mtime)
+        
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+    try:
+        st = os.fstat(fd)
+        return os.read(fd, st.st_size), st.st_mtime
+    finally:
+        os.close(fd)
+
+
 class CredentialManager:
     """Manages secure storage and retrieval of authentication credentials."""
     
@@ -21,7 +112,30 @@ class CredentialManager:
         )
         self._ensure_storage_directory()
         self._encryption_key = self._get_or_create_encryption_key()
-        self._cipher = Fernet(self._encryption_key)
+        # Fernet ciphers hold no per-call state, so worker threads share one
+        self._cipher = _create_cipher(self._encryption_key)
+        
+        # Decrypted credentials cache: service_name -> (credentials, file mtime, cached at)
+        self._cache: Dict[str, Tuple[Dict[str, Any], float, float]] = {}
+        self._cache_ttl = 300  # seconds
+        
+        # (service hash, credential file path) per service name, computed once
+        self._path_cache: Dict[str, Tuple[str, str]] = {}
+        
+        # Encrypted index of stored services: service hash -> service name
+        self._index_path = os.path.join(self.storage_path, '.index')
+        self._index: Dict[str, str] = self._load_index()
+        
+        # Serialized credentials awaiting a coalesced write: service_name -> JSON bytes
+        self._pending: Dict[str, bytes] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_delay = 0.05  # seconds
+        
+        # Serializes encrypt-and-write calls made from worker threads
+        self._write_lock = threading.Lock()
+        
+        # Serializes read-merge-write updates of the index file
+        self._index_lock = threading.Lock()
     
     def _ensure_storage_directory(self):
         """Ensure credential storage directory exists."""
@@ -29,7 +143,6 @@ class CredentialManager:
         
         # Set restrictive permissions on the directory (Windows)
         try:
-            import stat
             os.chmod(self.storage_path, stat.S_IRWXU)  # Owner read/write/execute only
         except Exception as e:
             logger.warning(f"Could not set directory permissions: {e}")
@@ -42,24 +155,21 @@ class CredentialManager:
         """
         key_file = os.path.join(self.storage_path, '.key')
         
-        if os.path.exists(key_file):
-            try:
-                with open(key_file, 'rb') as f:
-                    return f.read()
-            except Exception as e:
-                logger.error(f"Failed to read encryption key: {e}")
-                # Fall through to create new key
+        try:
+            key, _ = _read_private_file(key_file)
+            return key
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to read encryption key: {e}")
+            # Fall through to create new key
         
         # Create new encryption key
         key = Fernet.generate_key()
         
         try:
-            with open(key_file, 'wb') as f:
-                f.write(key)
-            
-            # Set restrictive permissions on key file
-            import stat
-            os.chmod(key_file, stat.S_IRUSR | stat.S_IWUSR)  # Owner read/write only
+            # Owner read/write only
+            _write_private_file(key_file, key)
             
             logger.info("Created new encryption key for credential storage")
             return key
@@ -68,6 +178,57 @@ class CredentialManager:
             logger.error(f"Failed to create encryption key: {e}")
             raise
     
+    def _resolve_service(self, service_name: str) -> Tuple[str, str]:
+        """Get the service hash and credential file path for a service.
+        
+        Args:
+            service_name: Name of the service (e.g., 'google_oauth')
+            
+        Returns:
+            Tuple of (service hash, full path to credential file)
+        """
+        resolved = self._path_cache.get(service_name)
+        if resolved is None:
+            # Hash service name to avoid filesystem issues
+            service_hash = hashlib.blake2b(service_name.encode(), digest_size=8).hexdigest()
+            file_path = os.path.join(self.storage_path, f"{service_hash}.cred")
+            self._migrate_legacy_file(service_name, service_hash, file_path)
+            resolved = (service_hash, file_path)
+            self._path_cache[service_name] = resolved
+        return resolved
+    
+    def _migrate_legacy_file(self, service_name: str, service_hash: str, file_path: str):
+        """Move credentials stored under the old SHA-256 file name to the current path.
+        
+        Every credential file on disk has an index entry, so services without
+        a legacy entry are skipped without touching the filesystem.
+        
+        Args:
+            service_name: Name of the service
+            service_hash: Current hash of the service name
+            file_path: Current credential file path
+        """
+        legacy_hash = hashlib.sha256(service_name.encode()).hexdigest()[:16]
+        if legacy_hash not in self._index:
+            return
+        
+        legacy_path = os.path.join(self.storage_path, f"{legacy_hash}.cred")
+        try:
+            added = {}
+            if os.path.exists(file_path):
+                os.remove(legacy_path)
+            else:
+                os.replace(legacy_path, file_path)
+                added[service_hash] = service_name
+            
+            self._update_index(added, (legacy_hash,))
+            logger.info(f"Migrated credential file for service: {service_name}")
+            
+        except FileNotFoundError:
+            self._index.pop(legacy_hash, None)
+        except Exception as e:
+            logger.error(f"Failed to migrate credential file for {service_name}: {e}")
+    
     def _get_credential_file_path(self, service_name: str) -> str:
         """Get file path for storing service credentials.
         
@@ -77,43 +238,231 @@ class CredentialManager:
         Returns:
             Full path to credential file
         """
-        # Hash service name to avoid filesystem issues
-        service_hash = hashlib.sha256(service_name.encode()).hexdigest()[:16]
-        return os.path.join(self.storage_path, f"{service_hash}.cred")
+        return self._resolve_service(service_name)[1]
+    
+    def _load_index(self) -> Dict[str, str]:
+        """Load the service index from disk.
+        
+        Credential files written before the index existed are listed under
+        their hash, since the service name cannot be recovered from it.
+        
+        Returns:
+            Mapping of service hash to service name
+        """
+        try:
+            encrypted_data, _ = _read_private_file(self._index_path)
+            return orjson.loads(self._cipher.decrypt(encrypted_data))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to read credential index, rebuilding: {e}")
+        
+        return {service_hash: service_hash for service_hash in self._scan_credential_files()}
+    
+    def _scan_credential_files(self) -> list:
+        """List the hashes of the credential files on disk (blocking).
+        
+        Returns:
+            Service hashes, taken from the credential file names
+        """
+        # d_type from the directory entry avoids a stat per file
+        with os.scandir(self.storage_path) as entries:
+            return [
+                entry.name[:-5]
+                for entry in entries
+                if entry.name.endswith('.cred') and entry.is_file(follow_symlinks=False)
+            ]
+    
+    def _update_index(self, added: Dict[str, str], removed=()):
+        """Merge changes into the on-disk service index (blocking).
+        
+        Other managers, in this process or another, write the same index, so
+        the file is re-read and the changes merged into it rather than
+        overwriting it with this instance's copy.
+        
+        Args:
+            added: Service hash -> service name entries to add
+            removed: Service hashes to remove
+        """
+        with self._index_lock:
+            index = self._load_index()
+            index.update(added)
+            for service_hash in removed:
+                index.pop(service_hash, None)
+            self._write_encrypted(self._index_path, orjson.dumps(index))
+            self._index = index
+    
+    def _write_encrypted(self, file_path: str, data: bytes):
+        """Encrypt data and write it to a private file (blocking).
+        
+        Args:
+            file_path: Destination file path
+            data: Plaintext bytes to encrypt
+        """
+        encrypted_data = self._cipher.encrypt(data)
+        with self._write_lock:
+            _write_private_file(file_path, encrypted_data)
+    
+    def _read_sync(self, file_path: str) -> Tuple[Dict[str, Any], float]:
+        """Read and decrypt a credential file (blocking).
+        
+        Args:
+            file_path: Credential file path
+            
+        Returns:
+            Tuple of (decrypted credentials, file mtime)
+        """
+        encrypted_data, mtime = _read_private_file(file_path)
+        return orjson.loads(self._cipher.decrypt(encrypted_data)), mtime
+    
+    def _delete_sync(self, file_path: str) -> bool:
+        """Remove a credential file if it exists (blocking).
+        
+        Returns:
+            True if a file was removed
+        """
+        with self._write_lock:
+            try:
+                os.remove(file_path)
+                return True
+            except FileNotFoundError:
+                return False
+    
+    def _list_sync(self) -> list:
+        """List stored services from the credential files on disk (blocking).
+        
+        The files are the source of truth; the index, re-read in case another
+        manager changed it, only supplies their service names.
+        
+        Returns:
+            Service names, or the file hash where no name is indexed
+        """
+        with self._index_lock:
+            self._index = self._load_index()
+        return [self._index.get(service_hash, service_hash) for service_hash in self._scan_credential_files()]
+    
+    def _clear_sync(self):
+        """Remove and recreate the storage directory (blocking)."""
+        with self._write_lock:
+            try:
+                shutil.rmtree(self.storage_path)
+                logger.warning("Cleared all stored credentials")
+            except FileNotFoundError:
+                pass
+            
+            # Recreate storage directory
+            self._ensure_storage_directory()
     
     async def store_credentials(self, service_name: str, credentials: Dict[str, Any]) -> bool:
         """Store encrypted credentials for a service.
         
+        Stores for the same service made within the flush delay are written
+        once, but every caller waits for the write that covers its data.
+        
         Args:
             service_name: Name of the service
             credentials: Credential data to store
             
         Returns:
-            True if storage successful
+            True once the credentials are written to disk
         """
         try:
-            # Serialize credentials to JSON
-            cred_json = json.dumps(credentials, indent=2)
+            # Serialize credentials to compact UTF-8 JSON bytes, ready to encrypt
+            cred_json = orjson.dumps(credentials)
             
-            # Encrypt credentials
-            encrypted_data = self._cipher.encrypt(cred_json.encode())
+            # Queue the write; stores for the same service within the flush
+            # delay collapse into a single encrypt and write
+            self._pending[service_name] = cred_json
+            self._cache.pop(service_name, None)
             
-            # Store to file
-            file_path = self._get_credential_file_path(service_name)
-            with open(file_path, 'wb') as f:
-                f.write(encrypted_data)
+            flush_task = self._flush_task
+            if flush_task is None or flush_task.get_loop() is not asyncio.get_running_loop():
+                flush_task = self._flush_task = asyncio.create_task(self._flush_soon())
             
-            # Set restrictive permissions
-            import stat
-            os.chmod(file_path, stat.S_IRUSR | stat.S_IWUSR)
+            logger.debug(f"Queued credentials for service: {service_name}")
             
-            logger.info(f"Stored credentials for service: {service_name}")
+            # Shielded so a cancelled caller doesn't cancel the write for everyone else
+            written = await asyncio.shield(flush_task)
+            if service_name not in written:
+                logger.error(f"Failed to store credentials for {service_name}")
+                return False
             return True
             
         except Exception as e:
             logger.error(f"Failed to store credentials for {service_name}: {e}")
             return False
     
+    async def _flush_soon(self) -> set:
+        """Write queued credentials after the flush delay.
+        
+        The write also runs if the task is cancelled (e.g. when the event
+        loop shuts down), so queued credentials are not lost.
+        
+        Returns:
+            Names of the services whose credentials were written
+        """
+        try:
+            await asyncio.sleep(self._flush_delay)
+        finally:
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None
+            written = await self._write_pending()
+        return written
+    
+    async def _write_pending(self) -> set:
+        """Encrypt and write all queued credentials.
+        
+        Entries stay queued until written so readers keep seeing them while
+        the write runs on a worker thread. Entries that fail to write are
+        dropped so readers don't see credentials that never reached disk.
+        
+        Returns:
+            Names of the services whose credentials were written
+        """
+        pending = [
+            (service_name, cred_json, *self._resolve_service(service_name))
+            for service_name, cred_json in self._pending.items()
+        ]
+        written = await asyncio.to_thread(self._write_entries, pending)
+        written_names = {service_name for service_name, *_ in written}
+        
+        for service_name, cred_json, _, _ in pending:
+            # Keep entries that were replaced while the write was running
+            if self._pending.get(service_name) is cred_json:
+                del self._pending[service_name]
+            self._cache.pop(service_name, None)
+        
+        if written:
+            added = {service_hash: service_name for service_name, _, service_hash, _ in written}
+            try:
+                await asyncio.to_thread(self._update_index, added)
+            except Exception as e:
+                logger.error(f"Failed to write credential index: {e}")
+        
+        return written_names
+    
+    def _write_entries(self, pending: list) -> list:
+        """Encrypt and write queued credential entries (blocking).
+        
+        Args:
+            pending: List of (service name, JSON, service hash, file path)
+            
+        Returns:
+            The entries that were written successfully
+        """
+        written = []
+        for entry in pending:
+            service_name, cred_json, _, file_path = entry
+            try:
+                # Encrypt and store to file with restrictive permissions
+                self._write_encrypted(file_path, cred_json)
+                written.append(entry)
+                logger.info(f"Stored credentials for service: {service_name}")
+                
+            except Exception as e:
+                logger.error(f"Failed to store credentials for {service_name}: {e}")
+        return written
+    
     async def get_credentials(self, service_name: str) -> Optional[Dict[str, Any]]:
         """Retrieve and decrypt credentials for a service.
         
@@ -124,19 +473,30 @@ class CredentialManager:
             Decrypted credential data or None if not found
         """
         try:
+            # Queued writes are newer than anything on disk
+            cred_json = self._pending.get(service_name)
+            if cred_json is not None:
+                return orjson.loads(cred_json)
+            
             file_path = self._get_credential_file_path(service_name)
             
-            if not os.path.exists(file_path):
+            try:
+                mtime = os.stat(file_path).st_mtime
+            except FileNotFoundError:
+                self._cache.pop(service_name, None)
                 logger.debug(f"No credentials found for service: {service_name}")
                 return None
             
-            # Read encrypted data
-            with open(file_path, 'rb') as f:
-                encrypted_data = f.read()
+            # Serve from cache while the file is unchanged and the entry is fresh
+            cached = self._cache.get(service_name)
+            if cached is not None:
+                cached_creds, cached_mtime, cached_at = cached
+                if cached_mtime == mtime and time.monotonic() - cached_at < self._cache_ttl:
+                    return copy.deepcopy(cached_creds)
             
-            # Decrypt credentials
-            decrypted_data = self._cipher.decrypt(encrypted_data)
-            credentials = json.loads(decrypted_data.decode())
+            # Read and decrypt off the event loop; keep the mtime of the bytes actually read
+            credentials, mtime = await asyncio.to_thread(self._read_sync, file_path)
+            self._cache[service_name] = (copy.deepcopy(credentials), mtime, time.monotonic())
             
             logger.debug(f"Retrieved credentials for service: {service_name}")
             return credentials
@@ -155,10 +515,13 @@ class CredentialManager:
             True if deletion successful
         """
         try:
-            file_path = self._get_credential_file_path(service_name)
+            service_hash, file_path = self._resolve_service(service_name)
+            self._pending.pop(service_name, None)
+            self._cache.pop(service_name, None)
             
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            await asyncio.to_thread(self._update_index, {}, (service_hash,))
+            
+            if await asyncio.to_thread(self._delete_sync, file_path):
                 logger.info(f"Deleted credentials for service: {service_name}")
             else:
                 logger.debug(f"No credentials to delete for service: {service_name}")
@@ -176,20 +539,7 @@ class CredentialManager:
             List of service names with stored credentials
         """
         try:
-            services = []
-            
-            if not os.path.exists(self.storage_path):
-                return services
-            
-            # This is a simplified approach - in practice, you might want to
-            # maintain a separate index file mapping hashes to service names
-            for filename in os.listdir(self.storage_path):
-                if filename.endswith('.cred'):
-                    # For now, we'll use a reverse lookup approach
-                    # In production, consider maintaining a service name index
-                    services.append(filename.replace('.cred', ''))
-            
-            return services
+            return await asyncio.to_thread(self._list_sync)
             
         except Exception as e:
             logger.error(f"Failed to list stored services: {e}")
@@ -202,13 +552,12 @@ class CredentialManager:
             True if clearing successful
         """
         try:
-            if os.path.exists(self.storage_path):
-                import shutil
-                shutil.rmtree(self.storage_path)
-                logger.warning("Cleared all stored credentials")
+            self._pending.clear()
+            self._cache.clear()
+            self._path_cache.clear()
+            self._index.clear()
             
-            # Recreate storage directory
-            self._ensure_storage_directory()
+            await asyncio.to_thread(self._clear_sync)
             
             return True
             
@@ -225,8 +574,10 @@ class CredentialManager:
         Returns:
             True if credentials are stored for the service
         """
-        file_path = self._get_credential_file_path(service_name)
-        return os.path.exists(file_path)
+        if service_name in self._pending:
+            return True
+        # The file is the source of truth; another process may have written or removed it
+        return os.path.exists(self._get_credential_file_path(service_name))
     
     async def update_credentials(self, service_name: str, updates: Dict[str, Any]) -> bool:
         """Update specific fields in stored credentials.
@@ -245,6 +596,12 @@ class CredentialManager:
                 logger.error(f"No existing credentials found for {service_name}")
                 return False
             
+            # Nothing to write when every field already has its new value
+            if all(key in existing_creds and existing_creds[key] == value
+                   for key, value in updates.items()):
+                logger.debug(f"Credentials unchanged for service: {service_name}")
+                return True
+            
             # Update with new values
             existing_creds.update(updates)
             
@@ -1,10 +1,18 @@
 import asyncio
-import json
+import concurrent.futures
+import copy
+import functools
+import orjson
 import os
+import re
+import stat
+import struct
 import sys
+import threading
+import time
+import webbrowser
 from pathlib import Path
-from typing import Dict, Any, Optional
-import subprocess
+from typing import Awaitable, Dict, Any, Optional, Callable, NamedTuple
 import tempfile
 from loguru import logger
 
@@ -15,22 +23,258 @@ sys.path.insert(0, str(project_root))
 from .google_oauth import GoogleOAuthManager
 from .credential_manager import CredentialManager
 
+# IPC frame header: little-endian uint32 payload length
+_FRAME_HEADER = struct.Struct('<I')
+
+# Socket used by `--socket` when no path is given: the per-user runtime
+# directory if there is one, else a per-user directory in the temp dir
+DEFAULT_SOCKET_PATH = (
+    Path(os.environ['XDG_RUNTIME_DIR']) / "voice_assistant_electron" / "ipc.sock"
+    if os.environ.get('XDG_RUNTIME_DIR')
+    else Path(tempfile.gettempdir()) / f"voice_assistant_electron-{getattr(os, 'getuid', lambda: '')()}" / "ipc.sock"
+)
+
+
+# How long a check_status result is reused, in seconds
+_AUTH_STATUS_TTL = 30.0
+
+# Fixed responses; handlers return a copy, since callers may add to a response
+_NOT_AUTHENTICATED = {'success': True, 'authenticated': False}
+_AUTH_REVOKED = {'success': True, 'message': 'Authentication revoked successfully'}
+_TASK_DELETED = {'success': True, 'message': 'Task deleted successfully'}
+_EVENT_DELETED = {'success': True, 'message': 'Event deleted successfully'}
+_FILE_DELETED = {'success': True, 'message': 'File deleted successfully'}
+
+
+def _error_response(error: str) -> Dict[str, Any]:
+    """Build a failure response for an error message."""
+    return {'success': False, 'error': error}
+
+
+# A leading "id" member, as Electron writes it, in a request that is not valid JSON
+_LEADING_ID = re.compile(rb'\s*\{\s*"id"\s*:\s*(-?\d+|"[^"\\]*")')
+
+
+def _salvage_request_id(body: bytes) -> Any:
+    """Find the id of a request body that is not valid JSON.
+    
+    Electron puts 'id' first in every request, so the error response for a
+    corrupted body can usually still carry it.
+    
+    Args:
+        body: Raw request frame body
+        
+    Returns:
+        The number or string id, or None if the body doesn't start with one
+    """
+    match = _LEADING_ID.match(body)
+    return orjson.loads(match.group(1)) if match else None
+
+
+def _ensure_private_dir(path: Path) -> None:
+    """Create a directory for the IPC socket, refusing one other users control.
+    
+    mkdir's mode is not applied when the directory already exists, so a
+    directory another local user created first could otherwise hold the socket.
+    
+    Args:
+        path: Directory to create or check
+        
+    Raises:
+        PermissionError: If the directory is not owned by this user with mode 0700
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != 0o700:
+        raise PermissionError(
+            f"Refusing to use socket directory {path}: it must be a directory "
+            f"owned by the current user with mode 0700"
+        )
+
+
+def _guarded(action: str):
+    """Decorate a handler so any exception becomes a logged failure response.
+    
+    Args:
+        action: What the handler does, for the error log (e.g. 'revoking authentication');
+            may reference the handler's positional arguments as format fields
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args):
+            try:
+                return await fn(self, *args)
+            except Exception as e:
+                logger.error(f"Error {action.format(*args)}: {e}")
+                return _error_response(str(e))
+        return wrapper
+    return decorator
+
+
+class _ApiRoute(NamedTuple):
+    """A Google API request type served by ElectronAuthHandler._run_api_route."""
+    service: str  # Service kind passed to GoogleOAuthManager.service
+    build: Callable[[Any, Dict[str, Any]], Any]  # (service, params) -> HttpRequest
+    result_key: Optional[str] = None  # Return only this list from the result
+    response: Optional[Dict[str, Any]] = None  # Return this fixed response instead of the result
+
+
+# Google API request types
+_API_ROUTES = {
+    # Google Tasks API requests
+    'tasks_list_tasklists': _ApiRoute(
+        'tasks', lambda svc, p: svc.tasklists().list(), result_key='items'),
+    'tasks_create_tasklist': _ApiRoute(
+        'tasks', lambda svc, p: svc.tasklists().insert(body={'title': p.get('title', 'New Task List')})),
+    'tasks_list_tasks': _ApiRoute(
+        'tasks', lambda svc, p: svc.tasks().list(tasklist=p.get('taskListId', '@default')), result_key='items'),
+    'tasks_create_task': _ApiRoute(
+        'tasks', lambda svc, p: svc.tasks().insert(
+            tasklist=p.get('taskListId', '@default'),
+            body=p.get('task', {})
+        )),
+    'tasks_update_task': _ApiRoute(
+        'tasks', lambda svc, p: svc.tasks().update(
+            tasklist=p.get('taskListId', '@default'),
+            task=p.get('taskId'),
+            body=p.get('task', {})
+        )),
+    'tasks_delete_task': _ApiRoute(
+        'tasks', lambda svc, p: svc.tasks().delete(
+            tasklist=p.get('taskListId', '@default'),
+            task=p.get('taskId')
+        ), response=_TASK_DELETED),
+    
+    # Google Calendar API requests
+    'calendar_list_calendars': _ApiRoute(
+        'calendar', lambda svc, p: svc.calendarList().list(), result_key='items'),
+    'calendar_list_events': _ApiRoute(
+        'calendar', lambda svc, p: svc.events().list(
+            calendarId=p.get('calendarId', 'primary'),
+            timeMin=p.get('timeMin'),
+            timeMax=p.get('timeMax'),
+            singleEvents=True,
+            orderBy='startTime'
+        ), result_key='items'),
+    'calendar_create_event': _ApiRoute(
+        'calendar', lambda svc, p: svc.events().insert(
+            calendarId=p.get('calendarId', 'primary'),
+            body=p.get('event', {})
+        )),
+    'calendar_update_event': _ApiRoute(
+        'calendar', lambda svc, p: svc.events().update(
+            calendarId=p.get('calendarId', 'primary'),
+            eventId=p.get('eventId'),
+            body=p.get('event', {})
+        )),
+    'calendar_delete_event': _ApiRoute(
+        'calendar', lambda svc, p: svc.events().delete(
+            calendarId=p.get('calendarId', 'primary'),
+            eventId=p.get('eventId')
+        ), response=_EVENT_DELETED),
+    
+    # Google Drive API requests
+    'drive_list_files': _ApiRoute(
+        'drive', lambda svc, p: svc.files().list(
+            q=p.get('query', ''),
+            pageSize=p.get('pageSize', 10),
+            fields="nextPageToken, files(id, name, mimeType, modifiedTime)"
+        ), result_key='files'),
+    # Metadata only; media upload is not handled yet
+    'drive_create_file': _ApiRoute(
+        'drive', lambda svc, p: svc.files().create(body=p.get('fileMetadata', {}), fields='id')),
+    'drive_get_file': _ApiRoute(
+        'drive', lambda svc, p: svc.files().get(
+            fileId=p.get('fileId'),
+            fields='id, name, mimeType, modifiedTime, size'
+        )),
+    'drive_update_file': _ApiRoute(
+        'drive', lambda svc, p: svc.files().update(fileId=p.get('fileId'), body=p.get('fileMetadata', {}))),
+    'drive_delete_file': _ApiRoute(
+        'drive', lambda svc, p: svc.files().delete(fileId=p.get('fileId')),
+        response=_FILE_DELETED),
+    
+    # Google Docs API requests
+    'docs_create_document': _ApiRoute(
+        'docs', lambda svc, p: svc.documents().create(body={'title': p.get('title', 'Untitled Document')})),
+    'docs_get_document': _ApiRoute(
+        'docs', lambda svc, p: svc.documents().get(documentId=p.get('documentId'))),
+    'docs_update_document': _ApiRoute(
+        'docs', lambda svc, p: svc.documents().batchUpdate(
+            documentId=p.get('documentId'),
+            body={'requests': p.get('requests', [])}
+        )),
+}
+
+
+# Google limits a batch HTTP request to 100 calls
+_MAX_BATCH_SIZE = 100
+
+
+class _ApiBatchRoute(NamedTuple):
+    """A Google API request type that runs one call per id in params['ids'], batched."""
+    service: str  # Service kind passed to GoogleOAuthManager.service
+    build: Callable[[Any, Dict[str, Any], str], Any]  # (service, params, id) -> HttpRequest
+
+
+# Batched Google API request types
+_API_BATCH_ROUTES = {
+    'tasks_batch_delete': _ApiBatchRoute(
+        'tasks', lambda svc, p, item_id: svc.tasks().delete(
+            tasklist=p.get('taskListId', '@default'),
+            task=item_id
+        )),
+    'calendar_batch_delete': _ApiBatchRoute(
+        'calendar', lambda svc, p, item_id: svc.events().delete(
+            calendarId=p.get('calendarId', 'primary'),
+            eventId=item_id
+        )),
+    'drive_batch_get': _ApiBatchRoute(
+        'drive', lambda svc, p, item_id: svc.files().get(
+            fileId=item_id,
+            fields='id, name, mimeType, modifiedTime, size'
+        )),
+}
+
+
 class ElectronAuthHandler:
     """
     Handles authentication and Google API calls for the Electron application.
     This class bridges between the Electron main process and Python authentication logic.
     """
     
+    # Request type -> handler method name; Google API requests come from _API_ROUTES
+    _DISPATCH = {
+        # Authentication requests
+        'start_auth': '_handle_start_auth',
+        'check_status': '_handle_check_status',
+        'revoke_auth': '_handle_revoke_auth',
+    }
+    
     def __init__(self):
         self.oauth_manager = GoogleOAuthManager()
         self.credential_manager = CredentialManager()
-        self.temp_dir = Path(tempfile.gettempdir()) / "voice_assistant_electron"
-        self.temp_dir.mkdir(exist_ok=True)
         
-        # IPC communication files
-        self.request_file = self.temp_dir / "auth_request.json"
-        self.response_file = self.temp_dir / "auth_response.json"
-        self.status_file = self.temp_dir / "auth_status.json"
+        # Bounded, reused worker threads for blocking Google API and credential I/O;
+        # also caps concurrent HTTPS requests to Google
+        self._api_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 4) * 4),
+            thread_name_prefix='googleapi'
+        )
+        
+        # Last check_status response: (monotonic time, response)
+        self._auth_cache = (0.0, None)
+        
+        # Bound handler per request type
+        self._handlers = {
+            request_type: getattr(self, method_name)
+            for request_type, method_name in self._DISPATCH.items()
+        }
+        for request_type, route in _API_ROUTES.items():
+            self._handlers[request_type] = functools.partial(self._run_api_route, request_type, route)
+        for request_type, route in _API_BATCH_ROUTES.items():
+            self._handlers[request_type] = functools.partial(self._run_api_batch_route, request_type, route)
         
         logger.info("ElectronAuthHandler initialized")
     
@@ -48,622 +292,310 @@ class ElectronAuthHandler:
             request_type = request_data.get('type')
             params = request_data.get('params', {})
             
-            logger.info(f"Handling request: {request_type}")
-            
-            # Authentication requests
-            if request_type == 'start_auth':
-                return await self._handle_start_auth(params)
-            elif request_type == 'check_status':
-                return await self._handle_check_status(params)
-            elif request_type == 'revoke_auth':
-                return await self._handle_revoke_auth(params)
-            
-            # Google Tasks API requests
-            elif request_type == 'tasks_list_tasklists':
-                return await self._handle_tasks_list_tasklists(params)
-            elif request_type == 'tasks_create_tasklist':
-                return await self._handle_tasks_create_tasklist(params)
-            elif request_type == 'tasks_list_tasks':
-                return await self._handle_tasks_list_tasks(params)
-            elif request_type == 'tasks_create_task':
-                return await self._handle_tasks_create_task(params)
-            elif request_type == 'tasks_update_task':
-                return await self._handle_tasks_update_task(params)
-            elif request_type == 'tasks_delete_task':
-                return await self._handle_tasks_delete_task(params)
+            handler = self._handlers.get(request_type)
+            if handler is None:
+                return _error_response(f'Unknown request type: {request_type}')
             
-            # Google Calendar API requests
-            elif request_type == 'calendar_list_calendars':
-                return await self._handle_calendar_list_calendars(params)
-            elif request_type == 'calendar_list_events':
-                return await self._handle_calendar_list_events(params)
-            elif request_type == 'calendar_create_event':
-                return await self._handle_calendar_create_event(params)
-            elif request_type == 'calendar_update_event':
-                return await self._handle_calendar_update_event(params)
-            elif request_type == 'calendar_delete_event':
-                return await self._handle_calendar_delete_event(params)
-            
-            # Google Drive API requests
-            elif request_type == 'drive_list_files':
-                return await self._handle_drive_list_files(params)
-            elif request_type == 'drive_create_file':
-                return await self._handle_drive_create_file(params)
-            elif request_type == 'drive_get_file':
-                return await self._handle_drive_get_file(params)
-            elif request_type == 'drive_update_file':
-                return await self._handle_drive_update_file(params)
-            elif request_type == 'drive_delete_file':
-                return await self._handle_drive_delete_file(params)
-            
-            # Google Docs API requests
-            elif request_type == 'docs_create_document':
-                return await self._handle_docs_create_document(params)
-            elif request_type == 'docs_get_document':
-                return await self._handle_docs_get_document(params)
-            elif request_type == 'docs_update_document':
-                return await self._handle_docs_update_document(params)
-            
-            else:
-                return {
-                    'success': False,
-                    'error': f'Unknown request type: {request_type}'
-                }
+            return await handler(params)
                 
         except Exception as e:
             logger.error(f"Error handling request {request_type}: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+            return _error_response(str(e))
     
     # Authentication handlers
+    @_guarded('starting authentication')
     async def _handle_start_auth(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Start Google OAuth authentication flow."""
-        try:
-            auth_url = await self.oauth_manager.get_authorization_url()
-            
-            # Open browser for authentication
-            import webbrowser
-            webbrowser.open(auth_url)
-            
-            # Wait for callback (this would be handled by the OAuth callback server)
-            # For now, we'll simulate the flow
-            return {
-                'success': True,
-                'auth_url': auth_url,
-                'message': 'Authentication started. Please complete in browser.'
-            }
-            
-        except Exception as e:
-            logger.error(f"Error starting authentication: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+        auth_url = await self.oauth_manager.get_authorization_url()
+        
+        # The status is bound to the current credentials
+        self._auth_cache = (0.0, None)
+        
+        # Open browser for authentication; launching it can block for seconds,
+        # so keep it off the event loop
+        await asyncio.to_thread(webbrowser.open, auth_url)
+        
+        # Wait for callback (this would be handled by the OAuth callback server)
+        # For now, we'll simulate the flow
+        return {
+            'success': True,
+            'auth_url': auth_url,
+            'message': 'Authentication started. Please complete in browser.'
+        }
     
+    @_guarded('checking auth status')
     async def _handle_check_status(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Check current authentication status."""
-        try:
-            is_authenticated = await self.oauth_manager.is_authenticated()
-            
-            if is_authenticated:
-                user_info = await self.oauth_manager.get_user_info()
-                return {
-                    'success': True,
-                    'authenticated': True,
-                    'user_info': user_info
-                }
-            else:
-                return {
-                    'success': True,
-                    'authenticated': False
-                }
-                
-        except Exception as e:
-            logger.error(f"Error checking auth status: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+        # The UI polls this; reuse a recent answer
+        now = time.monotonic()
+        cached_at, cached = self._auth_cache
+        if cached is not None and now - cached_at < _AUTH_STATUS_TTL:
+            return copy.deepcopy(cached)
+        
+        is_authenticated = await self.oauth_manager.is_authenticated()
+        
+        if is_authenticated:
+            user_info = await self.oauth_manager.get_user_info()
+            response = {
+                'success': True,
+                'authenticated': True,
+                'user_info': user_info
+            }
+            self._auth_cache = (now, response)
+            return copy.deepcopy(response)
+        else:
+            # Not cached, so a sign-in completed elsewhere shows up on the next poll
+            return dict(_NOT_AUTHENTICATED)
     
+    @_guarded('revoking authentication')
     async def _handle_revoke_auth(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Revoke Google authentication."""
-        try:
-            await self.oauth_manager.revoke_credentials()
-            return {
-                'success': True,
-                'message': 'Authentication revoked successfully'
-            }
-            
-        except Exception as e:
-            logger.error(f"Error revoking authentication: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    # Google Tasks API handlers
-    async def _handle_tasks_list_tasklists(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List Google Tasks task lists."""
-        try:
-            tasks_service = await self.oauth_manager.get_tasks_service()
-            result = tasks_service.tasklists().list().execute()
-            
-            return {
-                'success': True,
-                'data': result.get('items', [])
-            }
-            
-        except Exception as e:
-            logger.error(f"Error listing task lists: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_tasks_create_tasklist(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new Google Tasks task list."""
-        try:
-            title = params.get('title', 'New Task List')
-            tasks_service = await self.oauth_manager.get_tasks_service()
-            
-            tasklist = {
-                'title': title
-            }
-            
-            result = tasks_service.tasklists().insert(body=tasklist).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating task list: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_tasks_list_tasks(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List tasks in a Google Tasks task list."""
-        try:
-            tasklist_id = params.get('taskListId', '@default')
-            tasks_service = await self.oauth_manager.get_tasks_service()
-            
-            result = tasks_service.tasks().list(tasklist=tasklist_id).execute()
-            
-            return {
-                'success': True,
-                'data': result.get('items', [])
-            }
-            
-        except Exception as e:
-            logger.error(f"Error listing tasks: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_tasks_create_task(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new task in Google Tasks."""
-        try:
-            tasklist_id = params.get('taskListId', '@default')
-            task_data = params.get('task', {})
-            tasks_service = await self.oauth_manager.get_tasks_service()
-            
-            result = tasks_service.tasks().insert(
-                tasklist=tasklist_id,
-                body=task_data
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating task: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_tasks_update_task(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Update a task in Google Tasks."""
-        try:
-            tasklist_id = params.get('taskListId', '@default')
-            task_id = params.get('taskId')
-            task_data = params.get('task', {})
-            tasks_service = await self.oauth_manager.get_tasks_service()
-            
-            result = tasks_service.tasks().update(
-                tasklist=tasklist_id,
-                task=task_id,
-                body=task_data
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error updating task: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_tasks_delete_task(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Delete a task from Google Tasks."""
-        try:
-            tasklist_id = params.get('taskListId', '@default')
-            task_id = params.get('taskId')
-            tasks_service = await self.oauth_manager.get_tasks_service()
-            
-            tasks_service.tasks().delete(
-                tasklist=tasklist_id,
-                task=task_id
-            ).execute()
-            
-            return {
-                'success': True,
-                'message': 'Task deleted successfully'
-            }
-            
-        except Exception as e:
-            logger.error(f"Error deleting task: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    # Google Calendar API handlers (simplified implementations)
-    async def _handle_calendar_list_calendars(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List Google Calendar calendars."""
-        try:
-            calendar_service = await self.oauth_manager.get_calendar_service()
-            result = calendar_service.calendarList().list().execute()
-            
-            return {
-                'success': True,
-                'data': result.get('items', [])
-            }
-            
-        except Exception as e:
-            logger.error(f"Error listing calendars: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_calendar_list_events(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List events from Google Calendar."""
-        try:
-            calendar_id = params.get('calendarId', 'primary')
-            time_min = params.get('timeMin')
-            time_max = params.get('timeMax')
-            calendar_service = await self.oauth_manager.get_calendar_service()
-            
-            result = calendar_service.events().list(
-                calendarId=calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result.get('items', [])
-            }
-            
-        except Exception as e:
-            logger.error(f"Error listing events: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_calendar_create_event(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new Google Calendar event."""
-        try:
-            calendar_id = params.get('calendarId', 'primary')
-            event_data = params.get('event', {})
-            calendar_service = await self.oauth_manager.get_calendar_service()
-            
-            result = calendar_service.events().insert(
-                calendarId=calendar_id,
-                body=event_data
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating event: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_calendar_update_event(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Update a Google Calendar event."""
-        try:
-            calendar_id = params.get('calendarId', 'primary')
-            event_id = params.get('eventId')
-            event_data = params.get('event', {})
-            calendar_service = await self.oauth_manager.get_calendar_service()
-            
-            result = calendar_service.events().update(
-                calendarId=calendar_id,
-                eventId=event_id,
-                body=event_data
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error updating event: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_calendar_delete_event(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Delete a Google Calendar event."""
-        try:
-            calendar_id = params.get('calendarId', 'primary')
-            event_id = params.get('eventId')
-            calendar_service = await self.oauth_manager.get_calendar_service()
-            
-            calendar_service.events().delete(
-                calendarId=calendar_id,
-                eventId=event_id
-            ).execute()
-            
-            return {
-                'success': True,
-                'message': 'Event deleted successfully'
-            }
-            
-        except Exception as e:
-            logger.error(f"Error deleting event: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    # Google Drive API handlers (simplified implementations)
-    async def _handle_drive_list_files(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List files from Google Drive."""
-        try:
-            query = params.get('query', '')
-            page_size = params.get('pageSize', 10)
-            drive_service = await self.oauth_manager.get_drive_service()
-            
-            result = drive_service.files().list(
-                q=query,
-                pageSize=page_size,
-                fields="nextPageToken, files(id, name, mimeType, modifiedTime)"
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result.get('files', [])
-            }
-            
-        except Exception as e:
-            logger.error(f"Error listing files: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_drive_create_file(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a file in Google Drive."""
-        try:
-            file_metadata = params.get('fileMetadata', {})
-            media = params.get('media')
-            drive_service = await self.oauth_manager.get_drive_service()
-            
-            # This is a simplified implementation
-            # In practice, you'd handle media upload properly
-            result = drive_service.files().create(
-                body=file_metadata,
-                fields='id'
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating file: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    async def _handle_drive_get_file(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Get file metadata from Google Drive."""
-        try:
-            file_id = params.get('fileId')
-            drive_service = await self.oauth_manager.get_drive_service()
-            
-            result = drive_service.files().get(
-                fileId=file_id,
-                fields='id, name, mimeType, modifiedTime, size'
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting file: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+        if not await self.oauth_manager.revoke_credentials():
+            # The credentials are kept, so the cached status stays valid
+            return _error_response('Failed to revoke authentication')
+        
+        self._auth_cache = (0.0, None)
+        return dict(_AUTH_REVOKED)
     
-    async def _handle_drive_update_file(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Update a file in Google Drive."""
-        try:
-            file_id = params.get('fileId')
-            file_metadata = params.get('fileMetadata', {})
-            drive_service = await self.oauth_manager.get_drive_service()
-            
-            result = drive_service.files().update(
-                fileId=file_id,
-                body=file_metadata
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
+    @_guarded('handling {0}')
+    async def _run_api_route(self, request_type: str, route: '_ApiRoute', params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a Google API request described by a route.
+        
+        Args:
+            request_type: IPC request type, used for logging
+            route: Route describing the service and request to make
+            params: Request parameters from Electron
             
-        except Exception as e:
-            logger.error(f"Error updating file: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+        Returns:
+            Dictionary containing response data
+        """
+        service = await self.oauth_manager.service(route.service)
+        request = route.build(service, params)
+        
+        # Blocking HTTP call; run it off the event loop on a pooled connection
+        result = await asyncio.to_thread(self.oauth_manager.execute, request)
+        
+        if route.response is not None:
+            return dict(route.response)
+        
+        return {
+            'success': True,
+            'data': result.get(route.result_key, []) if route.result_key else result
+        }
     
-    async def _handle_drive_delete_file(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Delete a file from Google Drive."""
-        try:
-            file_id = params.get('fileId')
-            drive_service = await self.oauth_manager.get_drive_service()
-            
-            drive_service.files().delete(fileId=file_id).execute()
-            
-            return {
-                'success': True,
-                'message': 'File deleted successfully'
-            }
-            
-        except Exception as e:
-            logger.error(f"Error deleting file: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+    async def _open_stdin_reader(self) -> asyncio.StreamReader:
+        """Attach an asyncio stream reader to stdin."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        
+        if os.name == 'nt':
+            # The Windows proactor loop cannot attach to an inherited stdin pipe,
+            # so feed the reader from a daemon thread instead
+            def pump():
+                stdin = sys.stdin.buffer.raw
+                while chunk := stdin.read(65536):
+                    loop.call_soon_threadsafe(reader.feed_data, chunk)
+                loop.call_soon_threadsafe(reader.feed_eof)
+            
+            threading.Thread(target=pump, name='ipc-stdin', daemon=True).start()
+        else:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        
+        return reader
     
-    # Google Docs API handlers (simplified implementations)
-    async def _handle_docs_create_document(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new Google Docs document."""
-        try:
-            title = params.get('title', 'Untitled Document')
-            docs_service = await self.oauth_manager.get_docs_service()
-            
-            document = {
-                'title': title
-            }
-            
-            result = docs_service.documents().create(body=document).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
+    @_guarded('handling {0}')
+    async def _run_api_batch_route(self, request_type: str, route: _ApiBatchRoute, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one Google API call per id in a few batch HTTP requests.
+        
+        Args:
+            request_type: IPC request type, used for logging
+            route: Route describing the service and per-id request
+            params: Request parameters from Electron; 'ids' lists the items
             
-        except Exception as e:
-            logger.error(f"Error creating document: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
+        Returns:
+            Dictionary whose data maps each id to its ok/data/error outcome
+        """
+        ids = params.get('ids')
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, str) and i for i in ids):
+            return _error_response("'ids' must be a non-empty list of ids")
+        
+        service = await self.oauth_manager.service(route.service)
+        item_ids = list(dict.fromkeys(ids))
+        results = {}
+        
+        def record(request_id, response, exception):
+            results[request_id] = {
+                'ok': exception is None,
+                'data': response,
+                'error': str(exception) if exception is not None else None
             }
+        
+        batches = []
+        for start in range(0, len(item_ids), _MAX_BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=record)
+            for item_id in item_ids[start:start + _MAX_BATCH_SIZE]:
+                batch.add(route.build(service, params, item_id), request_id=item_id)
+            batches.append(batch)
+        
+        def execute_all():
+            for batch in batches:
+                self.oauth_manager.execute(batch)
+        
+        # Blocking HTTP calls; run them off the event loop on a pooled connection
+        await asyncio.to_thread(execute_all)
+        
+        return {
+            'success': True,
+            'data': results
+        }
     
-    async def _handle_docs_get_document(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Get a Google Docs document."""
-        try:
-            document_id = params.get('documentId')
-            docs_service = await self.oauth_manager.get_docs_service()
-            
-            result = docs_service.documents().get(documentId=document_id).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting document: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+    async def _serve_frames(self, reader: asyncio.StreamReader, write: Callable[[bytes], None],
+                            drain: Optional[Callable[[], Awaitable[None]]] = None):
+        """Serve length-prefixed requests from a stream until it closes.
+        
+        Requests are handled concurrently, so responses can arrive out of
+        order; a request's 'id' is echoed in its response.
+        
+        Args:
+            reader: Stream carrying request frames
+            write: Sends a chunk of response frames
+            drain: Waits until written data is flushed (e.g. StreamWriter.drain),
+                so a slow client cannot grow the write buffer without limit
+        """
+        outbox = []
+        in_flight = set()
+        
+        async def serve(body: bytes):
+            request_id = None
+            try:
+                request_data = orjson.loads(body)
+                request_id = request_data.get('id')
+            except (ValueError, AttributeError) as e:
+                if request_id is None and isinstance(e, ValueError):
+                    request_id = _salvage_request_id(body)
+                response = _error_response(f'Invalid request: {e}')
+            else:
+                # Process request
+                response = await self.handle_request(request_data)
+                # Per-request log on the hot path: DEBUG, formatted only if emitted
+                logger.debug("Processed request: {}", request_data.get('type'))
+            
+            if request_id is not None:
+                response = {**response, 'id': request_id}
+            
+            # Queue response
+            payload = orjson.dumps(response)
+            outbox.append(_FRAME_HEADER.pack(len(payload)) + payload)
+            if len(outbox) > 1:
+                return
+            
+            # First response queued: let others finishing this loop iteration
+            # join it, then send them all in one write
+            await asyncio.sleep(0)
+            write(b''.join(outbox))
+            outbox.clear()
+            if drain is not None:
+                try:
+                    await drain()
+                except ConnectionError:
+                    # Client went away; the read loop ends on its own
+                    pass
+        
+        while True:
+            try:
+                header = await reader.readexactly(_FRAME_HEADER.size)
+                body = await reader.readexactly(_FRAME_HEADER.unpack(header)[0])
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            
+            # Frames already buffered are read without yielding, so a burst
+            # of requests is dispatched together
+            task = asyncio.create_task(serve(body))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        
+        # Answer requests still in flight before returning
+        await asyncio.gather(*in_flight)
     
-    async def _handle_docs_update_document(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Update a Google Docs document."""
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one socket connection from Electron."""
+        logger.info("Electron connected to IPC socket")
         try:
-            document_id = params.get('documentId')
-            requests = params.get('requests', [])
-            docs_service = await self.oauth_manager.get_docs_service()
-            
-            result = docs_service.documents().batchUpdate(
-                documentId=document_id,
-                body={'requests': requests}
-            ).execute()
-            
-            return {
-                'success': True,
-                'data': result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error updating document: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+            await self._serve_frames(reader, writer.write, writer.drain)
+        finally:
+            writer.close()
+            logger.info("Electron disconnected from IPC socket")
     
-    def start_ipc_server(self):
-        """Start IPC server to handle requests from Electron."""
+    def start_ipc_server(self, socket_path: Optional[str] = None):
+        """Start IPC server to handle requests from Electron.
+        
+        By default Electron spawns this process and talks to it over stdio.
+        With socket_path, requests are served on a Unix domain socket at that
+        path instead (Electron connects with net.createConnection); on
+        Windows a loopback TCP port is used and printed to stdout as
+        {"port": N}. Every message in either direction is a 4-byte
+        little-endian length followed by a UTF-8 JSON body.
+        
+        Args:
+            socket_path: Unix socket path to listen on instead of stdio
+        """
+        if socket_path is not None:
+            asyncio.run(self._run_socket_server(socket_path))
+            return
+        
+        # Responses own stdout; send stray prints to stderr so they cannot corrupt frames
+        out = sys.stdout.buffer
+        sys.stdout = sys.stderr
+        
+        def write(data: bytes):
+            out.write(data)
+            out.flush()
+        
         async def ipc_loop():
             logger.info("Starting IPC server for Electron communication")
-            
-            while True:
-                try:
-                    # Check for new requests
-                    if self.request_file.exists():
-                        with open(self.request_file, 'r') as f:
-                            request_data = json.load(f)
-                        
-                        # Process request
-                        response = await self.handle_request(request_data)
-                        
-                        # Write response
-                        with open(self.response_file, 'w') as f:
-                            json.dump(response, f)
-                        
-                        # Clean up request file
-                        self.request_file.unlink()
-                        
-                        logger.info(f"Processed request: {request_data.get('type')}")
-                    
-                    # Small delay to prevent busy waiting
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    logger.error(f"Error in IPC loop: {str(e)}")
-                    await asyncio.sleep(1)
+            asyncio.get_running_loop().set_default_executor(self._api_executor)
+            reader = await self._open_stdin_reader()
+            await self._serve_frames(reader, write)
+            logger.info("IPC pipe closed by Electron, stopping")
         
         # Run the IPC loop
         asyncio.run(ipc_loop())
+    
+    async def _run_socket_server(self, socket_path: str):
+        """Serve Electron connections on a local socket until cancelled."""
+        asyncio.get_running_loop().set_default_executor(self._api_executor)
+        
+        if os.name == 'nt' or not hasattr(asyncio, 'start_unix_server'):
+            server = await asyncio.start_server(self._handle_client, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            print(orjson.dumps({'port': port}).decode(), flush=True)
+            logger.info(f"Starting IPC server on 127.0.0.1:{port}")
+        else:
+            _ensure_private_dir(Path(socket_path).parent)
+            
+            # Remove a socket left behind by a previous run
+            try:
+                os.unlink(socket_path)
+            except FileNotFoundError:
+                pass
+            server = await asyncio.start_unix_server(self._handle_client, path=socket_path)
+            # The socket grants access to the user's Google account; owner only
+            os.chmod(socket_path, 0o600)
+            logger.info(f"Starting IPC server on {socket_path}")
+        
+        async with server:
+            await server.serve_forever()
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Google auth and API bridge for Electron")
+    parser.add_argument(
+        '--socket', nargs='?', const=str(DEFAULT_SOCKET_PATH), metavar='PATH',
+        help=f"serve on a Unix socket instead of stdio (default path: {DEFAULT_SOCKET_PATH})"
+    )
+    args = parser.parse_args()
+    
     # Start the Electron auth handler
     handler = ElectronAuthHandler()
-    handler.start_ipc_server()
\ No newline at end of file
+    handler.start_ipc_server(socket_path=args.socket)
@@ -1,6 +1,6 @@
 # Placeholder script: get_auth_url_script.py
-import asyncio
 import sys
+import asyncio
 import os
 
 # Adjust the Python path to include the parent directory of 'auth'
@@ -14,8 +14,10 @@ from auth.google_oauth import GoogleOAuthManager
 
 async def main():
     manager = GoogleOAuthManager()
+    # Stores the PKCE flow state, replacing any earlier flow, so that
+    # submit_auth_code_script can complete it in another process.
     # Ensure this redirect_uri matches what's in main.js and Google Cloud Console
-    url = manager.initialize_flow(redirect_uri='http://localhost:8080/oauth/callback')
+    url = await manager.get_authorization_url(redirect_uri='http://localhost:8080/oauth/callback')
     print(url)
 
 if __name__ == '__main__':
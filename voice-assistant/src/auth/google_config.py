@@ -1,6 +1,8 @@
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple
 
 class GoogleConfig:
     """
@@ -14,8 +16,11 @@ class GoogleConfig:
     # Redirect URI for OAuth flow
     REDIRECT_URI = 'http://localhost:8080/oauth/callback'
     
-    # OAuth 2.0 Scopes for Google Workspace services
-    SCOPES = [
+    # Endpoint for revoking access and refresh tokens
+    TOKEN_REVOKE_URI = 'https://oauth2.googleapis.com/revoke'
+    
+    # OAuth 2.0 Scopes for Google Workspace services (read-only sets)
+    SCOPES = frozenset((
         # Google Tasks
         'https://www.googleapis.com/auth/tasks',
         'https://www.googleapis.com/auth/tasks.readonly',
@@ -38,41 +43,41 @@ class GoogleConfig:
         'https://www.googleapis.com/auth/userinfo.profile',
         'https://www.googleapis.com/auth/userinfo.email',
         'openid'
-    ]
+    ))
     
     # Minimal scopes for basic functionality
-    MINIMAL_SCOPES = [
+    MINIMAL_SCOPES = frozenset((
         'https://www.googleapis.com/auth/tasks',
         'https://www.googleapis.com/auth/calendar.events',
         'https://www.googleapis.com/auth/userinfo.profile',
         'openid'
-    ]
+    ))
     
     # Service-specific scope groups
     SCOPE_GROUPS = {
-        'tasks': [
+        'tasks': frozenset((
             'https://www.googleapis.com/auth/tasks',
             'https://www.googleapis.com/auth/tasks.readonly'
-        ],
-        'calendar': [
+        )),
+        'calendar': frozenset((
             'https://www.googleapis.com/auth/calendar',
             'https://www.googleapis.com/auth/calendar.events',
             'https://www.googleapis.com/auth/calendar.readonly'
-        ],
-        'drive': [
+        )),
+        'drive': frozenset((
             'https://www.googleapis.com/auth/drive',
             'https://www.googleapis.com/auth/drive.file',
             'https://www.googleapis.com/auth/drive.readonly'
-        ],
-        'docs': [
+        )),
+        'docs': frozenset((
             'https://www.googleapis.com/auth/documents',
             'https://www.googleapis.com/auth/documents.readonly'
-        ],
-        'profile': [
+        )),
+        'profile': frozenset((
             'https://www.googleapis.com/auth/userinfo.profile',
             'https://www.googleapis.com/auth/userinfo.email',
             'openid'
-        ]
+        ))
     }
     
     # API Service Discovery URLs
@@ -120,7 +125,7 @@ class GoogleConfig:
     }
     
     @classmethod
-    def get_scopes_for_services(cls, services: List[str]) -> List[str]:
+    def get_scopes_for_services(cls, services: List[str]) -> Tuple[str, ...]:
         """
         Get OAuth scopes for specific services.
         
@@ -128,19 +133,22 @@ class GoogleConfig:
             services: List of service names (e.g., ['tasks', 'calendar'])
             
         Returns:
-            List of OAuth scopes
+            Sorted tuple of OAuth scopes (shared between calls)
         """
-        scopes = set()
-        
-        # Always include profile scopes
-        scopes.update(cls.SCOPE_GROUPS['profile'])
-        
-        # Add service-specific scopes
-        for service in services:
-            if service in cls.SCOPE_GROUPS:
-                scopes.update(cls.SCOPE_GROUPS[service])
+        return _scopes_for(cls, frozenset(services))
+    
+    @classmethod
+    def service_for_scope(cls, scope: str) -> Optional[str]:
+        """
+        Get the service a scope belongs to.
         
-        return list(scopes)
+        Args:
+            scope: OAuth scope URL (e.g., 'https://www.googleapis.com/auth/tasks')
+            
+        Returns:
+            Service name from SCOPE_GROUPS, or None for an unknown scope
+        """
+        return cls._SCOPE_TO_SERVICE.get(scope)
     
     @classmethod
     def validate_config(cls) -> Dict[str, Any]:
@@ -207,7 +215,7 @@ class GoogleConfig:
         """
         return {
             'name': service_name,
-            'scopes': cls.SCOPE_GROUPS.get(service_name, []),
+            'scopes': sorted(cls.SCOPE_GROUPS.get(service_name, ())),
             'discovery_url': cls.SERVICE_DISCOVERY_URLS.get(service_name),
             'rate_limits': cls.API_RATE_LIMITS.get(service_name, {})
         }
@@ -216,18 +224,41 @@ class GoogleConfig:
     def ensure_credentials_dir(cls) -> None:
         """
         Ensure the credentials directory exists.
+        
+        Safe to call repeatedly: the directory or .gitignore may have been
+        removed since the last call.
         """
         cls.CREDENTIALS_DIR.mkdir(parents=True, exist_ok=True)
         
-        # Create .gitignore to prevent committing credentials
+        # Create .gitignore to prevent committing credentials; exclusive
+        # create leaves an existing file alone without a separate stat
         gitignore_file = cls.CREDENTIALS_DIR / '.gitignore'
-        if not gitignore_file.exists():
-            with open(gitignore_file, 'w') as f:
+        try:
+            with open(gitignore_file, 'x') as f:
                 f.write('# Ignore all credential files\n')
                 f.write('*.json\n')
                 f.write('*.key\n')
                 f.write('*.pem\n')
                 f.write('*.p12\n')
+        except FileExistsError:
+            pass
+
+# Read-only reverse index of SCOPE_GROUPS: scope -> service
+GoogleConfig._SCOPE_TO_SERVICE = MappingProxyType({
+    scope: service
+    for service, scopes in GoogleConfig.SCOPE_GROUPS.items()
+    for scope in scopes
+})
+
+@lru_cache(maxsize=32)
+def _scopes_for(config_cls, services: frozenset) -> Tuple[str, ...]:
+    """Compute (and memoize) the sorted scopes for a set of services under a config class."""
+    scope_groups = config_cls.SCOPE_GROUPS
+    
+    # Always include profile scopes, plus the groups of known services
+    return tuple(sorted(scope_groups['profile'].union(
+        *(scope_groups[service] for service in services if service in scope_groups)
+    )))
 
 # Environment-specific configurations
 class DevelopmentConfig(GoogleConfig):
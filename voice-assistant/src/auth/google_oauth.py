@@ -1,25 +1,66 @@
 import os
 import json
 import asyncio
-from typing import Optional, Dict, Any, List
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache, partial, partialmethod
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Tuple, TYPE_CHECKING
+from urllib.parse import urlencode
 from loguru import logger
 from .credential_manager import CredentialManager
+from .google_config import GoogleConfig
+
+# The Google client libraries are imported where they are used: they pull in
+# httplib2, protobuf and hundreds of modules that many sessions never need
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google.auth.transport.requests import Request
+    from google_auth_httplib2 import AuthorizedHttp
+
+# Config files shared with main.js, resolved once at import
+_CONFIG_DIR = Path(__file__).resolve().parent.parent.parent / 'config'
+_DEFAULT_SECRETS = _CONFIG_DIR / 'google_client_secrets.json'
+_DEFAULT_TOKEN = _CONFIG_DIR / 'token.json'
+_DEFAULT_REFRESH = _CONFIG_DIR / 'refresh_token.json'
+
+# Credential store key for an OAuth flow awaiting its authorization code
+_FLOW_STATE_KEY = 'google_oauth_flow'
+
+# Default API versions
+_DEFAULT_VERSIONS = MappingProxyType({
+    'tasks': 'v1',
+    'calendar': 'v3',
+    'drive': 'v3',
+    'docs': 'v1'
+})
+
+@lru_cache(maxsize=4)
+def _load_client_config(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a client secrets file, cached per path and modification time.
+    
+    Args:
+        path: Path to the client secrets JSON file
+        mtime_ns: File modification time; a changed file gets a new cache entry
+        
+    Returns:
+        Parsed client configuration (shared, do not mutate)
+    """
+    with open(path, 'rb') as f:
+        return json.loads(f.read())
 
 class GoogleOAuthManager:
     """Manages Google OAuth 2.0 authentication flow and API client initialization."""
     
     # Google OAuth 2.0 scopes for different services
-    SCOPES = {
+    SCOPES = MappingProxyType({
         'tasks': 'https://www.googleapis.com/auth/tasks',
         'calendar': 'https://www.googleapis.com/auth/calendar',
         'drive': 'https://www.googleapis.com/auth/drive.file',
         'keep': 'https://www.googleapis.com/auth/keep',  # Note: Keep API has limited availability
         'docs': 'https://www.googleapis.com/auth/documents'
-    }
+    })
     
     def __init__(self, client_secrets_path: str = None):
         """Initialize OAuth manager with client secrets.
@@ -27,46 +68,78 @@ class GoogleOAuthManager:
         Args:
             client_secrets_path: Path to Google OAuth client secrets JSON file
         """
-        self.client_secrets_path = client_secrets_path or os.path.join(
-            os.path.dirname(__file__), '..', '..', 'config', 'google_client_secrets.json'
-        )
+        self.client_secrets_path = client_secrets_path or str(_DEFAULT_SECRETS)
         self.credential_manager = CredentialManager()
         self.flow = None
+        # State needed to rebuild self.flow in another process (see _restore_flow)
+        self._flow_state: Optional[Dict[str, Any]] = None
         self._credentials = None
         
+        # Per-thread authorized HTTP client; httplib2 is not thread-safe, but a
+        # client reused by one thread keeps its connections alive between calls
+        self._http_local = threading.local()
+        
+        # Built API clients: (service, version) -> (credentials they use, client)
+        self._client_cache: Dict[tuple, tuple] = {}
+        
+        # Token endpoint transport shared by refresh and revoke (see _get_transport)
+        self._transport = None
+        
+        # Background refresh started when a loaded token is close to expiry
+        self._refresh_task: Optional[asyncio.Task] = None
+        
+        # In-flight load_credentials shared by concurrent _ensure_credentials callers
+        self._load_task: Optional[asyncio.Future] = None
+        
         # Token file paths for compatibility with main.js
-        self.token_path = os.path.join(
-            os.path.dirname(__file__), '..', '..', 'config', 'token.json'
-        )
-        self.refresh_token_path = os.path.join(
-            os.path.dirname(__file__), '..', '..', 'config', 'refresh_token.json'
-        )
+        self.token_path = str(_DEFAULT_TOKEN)
+        self.refresh_token_path = str(_DEFAULT_REFRESH)
         
-    def _get_required_scopes(self, services: List[str] = None) -> List[str]:
+    def _get_required_scopes(self, services: List[str] = None) -> Tuple[str, ...]:
         """Get required OAuth scopes for specified services.
         
         Args:
             services: List of service names ('tasks', 'calendar', 'drive', 'docs')
             
         Returns:
-            List of OAuth scope URLs
+            Sorted tuple of unique OAuth scope URLs
         """
         if not services:
             # Default to all available services
-            services = ['tasks', 'calendar', 'drive', 'docs']
+            services = ('tasks', 'calendar', 'drive', 'docs')
             
-        scopes = []
+        scopes = set()
         for service in services:
             if service in self.SCOPES:
-                scopes.append(self.SCOPES[service])
+                scopes.add(self.SCOPES[service])
             else:
                 logger.warning(f"Unknown service: {service}")
-                
-        return scopes
+        
+        # Sorted so the same services always produce the same authorization URL
+        return tuple(sorted(scopes))
+    
+    def _client_config(self) -> Dict[str, Any]:
+        """Get the parsed client secrets, re-reading the file only after it changes.
+        
+        Returns:
+            Client configuration as accepted by Flow.from_client_config
+        """
+        # One stat both checks the file exists and keys the parsed-config cache
+        try:
+            mtime_ns = os.stat(self.client_secrets_path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Google client secrets file not found at {self.client_secrets_path}. "
+                "Please download it from Google Cloud Console and place it in the config directory."
+            ) from None
+        return _load_client_config(self.client_secrets_path, mtime_ns)
     
     def initialize_flow(self, services: List[str] = None, redirect_uri: str = 'http://localhost:8080/oauth/callback') -> str:
         """Initialize OAuth flow and return authorization URL.
         
+        The flow is kept on this manager only; use get_authorization_url when
+        another process may receive the authorization code.
+        
         Args:
             services: List of Google services to request access for
             redirect_uri: OAuth redirect URI
@@ -75,27 +148,32 @@ class GoogleOAuthManager:
             Authorization URL for user to visit
         """
         try:
-            if not os.path.exists(self.client_secrets_path):
-                raise FileNotFoundError(
-                    f"Google client secrets file not found at {self.client_secrets_path}. "
-                    "Please download it from Google Cloud Console and place it in the config directory."
-                )
+            client_config = self._client_config()
+            
+            from google_auth_oauthlib.flow import Flow
             
             scopes = self._get_required_scopes(services)
             
-            self.flow = Flow.from_client_secrets_file(
-                self.client_secrets_path,
+            self.flow = Flow.from_client_config(
+                client_config,
                 scopes=scopes,
                 redirect_uri=redirect_uri
             )
             
             # Generate authorization URL
-            auth_url, _ = self.flow.authorization_url(
+            auth_url, state = self.flow.authorization_url(
                 access_type='offline',
                 include_granted_scopes='true',
                 prompt='consent'  # Force consent screen to get refresh token
             )
             
+            self._flow_state = {
+                'scopes': list(scopes),
+                'redirect_uri': redirect_uri,
+                'state': state,
+                'code_verifier': self.flow.code_verifier
+            }
+            
             logger.info(f"OAuth flow initialized for services: {services}")
             return auth_url
             
@@ -103,6 +181,23 @@ class GoogleOAuthManager:
             logger.error(f"Failed to initialize OAuth flow: {e}")
             raise
     
+    def _creds_to_dict(self) -> Dict[str, Any]:
+        """Convert the current credentials to the record kept in the credential store.
+        
+        Returns:
+            Dictionary of token fields, as read back by load_credentials
+        """
+        c = self._credentials
+        return {
+            'token': c.token,
+            'refresh_token': c.refresh_token,
+            'token_uri': c.token_uri,
+            'client_id': c.client_id,
+            'client_secret': c.client_secret,
+            'scopes': sorted(set(c.scopes)) if c.scopes else [],
+            'expiry': c.expiry.isoformat() if c.expiry else None
+        }
+    
     async def handle_callback(self, authorization_code: str) -> bool:
         """Handle OAuth callback and exchange code for tokens.
         
@@ -113,6 +208,9 @@ class GoogleOAuthManager:
             True if authentication successful, False otherwise
         """
         try:
+            if not self.flow:
+                # The URL may have come from another process (e.g. the Electron handler)
+                self.flow = await self._restore_flow()
             if not self.flow:
                 raise ValueError("OAuth flow not initialized. Call initialize_flow() first.")
             
@@ -121,17 +219,13 @@ class GoogleOAuthManager:
             self._credentials = self.flow.credentials
             
             # Store credentials securely
-            await self.credential_manager.store_credentials(
-                'google_oauth',
-                {
-                    'token': self._credentials.token,
-                    'refresh_token': self._credentials.refresh_token,
-                    'token_uri': self._credentials.token_uri,
-                    'client_id': self._credentials.client_id,
-                    'client_secret': self._credentials.client_secret,
-                    'scopes': self._credentials.scopes
-                }
-            )
+            if not await self.credential_manager.store_credentials('google_oauth', self._creds_to_dict()):
+                raise RuntimeError("Failed to store credentials")
+            
+            # The code verifier and state are single-use
+            self.flow = None
+            self._flow_state = None
+            await self.credential_manager.delete_credentials(_FLOW_STATE_KEY)
             
             logger.info("Google OAuth authentication successful")
             return True
@@ -140,7 +234,7 @@ class GoogleOAuthManager:
             logger.error(f"OAuth callback handling failed: {e}")
             return False
     
-    async def load_credentials(self) -> Optional[Credentials]:
+    async def load_credentials(self) -> Optional['Credentials']:
         """Load stored credentials and refresh if necessary.
         
         Returns:
@@ -153,33 +247,31 @@ class GoogleOAuthManager:
                 logger.info("No stored Google credentials found")
                 return None
             
-            # Reconstruct credentials object
+            from google.oauth2.credentials import Credentials
+            
+            # Reconstruct credentials object; records saved before the expiry
+            # was tracked have none
+            expiry = cred_data.get('expiry')
             self._credentials = Credentials(
                 token=cred_data.get('token'),
                 refresh_token=cred_data.get('refresh_token'),
                 token_uri=cred_data.get('token_uri'),
                 client_id=cred_data.get('client_id'),
                 client_secret=cred_data.get('client_secret'),
-                scopes=cred_data.get('scopes')
+                scopes=cred_data.get('scopes'),
+                expiry=datetime.fromisoformat(expiry) if expiry else None
             )
             
-            # Refresh token if expired
-            if self._credentials.expired and self._credentials.refresh_token:
-                logger.info("Refreshing expired Google OAuth token")
-                self._credentials.refresh(Request())
-                
-                # Update stored credentials with new token
-                await self.credential_manager.store_credentials(
-                    'google_oauth',
-                    {
-                        'token': self._credentials.token,
-                        'refresh_token': self._credentials.refresh_token,
-                        'token_uri': self._credentials.token_uri,
-                        'client_id': self._credentials.client_id,
-                        'client_secret': self._credentials.client_secret,
-                        'scopes': self._credentials.scopes
-                    }
-                )
+            if self._credentials.refresh_token:
+                if self._credentials.expiry is None or self._credentials.expired:
+                    # Nothing known to be usable until the refresh completes,
+                    # so wait for it; it also records the expiry
+                    logger.info("Refreshing expired Google OAuth token")
+                    await self._refresh_credentials()
+                elif self._seconds_until_expiry() < GoogleConfig.TOKEN_REFRESH_THRESHOLD:
+                    # Still valid: hand it out now and refresh in the
+                    # background before callers hit the expiry
+                    self._schedule_refresh()
             
             return self._credentials
             
@@ -187,6 +279,63 @@ class GoogleOAuthManager:
             logger.error(f"Failed to load Google credentials: {e}")
             return None
     
+    def _seconds_until_expiry(self) -> float:
+        """Get the remaining lifetime of the current access token.
+        
+        Returns:
+            Seconds until expiry; the expiry must be known
+        """
+        # Credentials keep expiry as a naive UTC datetime
+        return (self._credentials.expiry - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()
+    
+    async def _call_token_endpoint(self, method) -> None:
+        """Call a credentials method that talks to Google's token endpoint.
+        
+        The call is a blocking HTTPS round-trip, so it runs on a worker
+        thread. Transport errors are retried with exponential backoff, up
+        to GoogleConfig.MAX_REFRESH_ATTEMPTS attempts in total.
+        
+        Args:
+            method: Callable taking a transport (credentials refresh or _revoke_token)
+        """
+        from google.auth.exceptions import TransportError
+        
+        for attempt in range(GoogleConfig.MAX_REFRESH_ATTEMPTS):
+            try:
+                await asyncio.to_thread(method, self._get_transport())
+                return
+            except TransportError as e:
+                if attempt + 1 >= GoogleConfig.MAX_REFRESH_ATTEMPTS:
+                    raise
+                delay = 0.25 * 2 ** attempt
+                logger.warning(f"Token endpoint request failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+    
+    async def _refresh_credentials(self) -> None:
+        """Refresh the access token and persist the fields that changed."""
+        await self._call_token_endpoint(self._credentials.refresh)
+        
+        # A refresh returns a new access token and expiry, and may rotate the
+        # refresh token or narrow the scopes; update_credentials only writes
+        # the record when one of these differs from the stored value
+        record = self._creds_to_dict()
+        updates = {key: record[key] for key in ('token', 'refresh_token', 'scopes', 'expiry')}
+        if not await self.credential_manager.update_credentials('google_oauth', updates):
+            logger.warning("Failed to store refreshed Google OAuth token")
+    
+    def _schedule_refresh(self) -> None:
+        """Start a background token refresh unless one is already running."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+    
+    async def _background_refresh(self) -> None:
+        """Refresh the token ahead of its expiry; failures leave the current token in use."""
+        try:
+            await self._refresh_credentials()
+            logger.info("Refreshed Google OAuth token ahead of expiry")
+        except Exception as e:
+            logger.warning(f"Background token refresh failed: {e}")
+    
     def get_api_client(self, service_name: str, version: str = None):
         """Get authenticated Google API client for specified service.
         
@@ -200,25 +349,96 @@ class GoogleOAuthManager:
         if not self._credentials:
             raise ValueError("No valid credentials available. Please authenticate first.")
         
-        # Default API versions
-        default_versions = {
-            'tasks': 'v1',
-            'calendar': 'v3',
-            'drive': 'v3',
-            'docs': 'v1'
-        }
+        api_version = version or _DEFAULT_VERSIONS.get(service_name, 'v1')
         
-        api_version = version or default_versions.get(service_name, 'v1')
+        # Clients hold a reference to the credentials, which refresh in place,
+        # so a cached client stays valid until the credentials object changes
+        cached = self._client_cache.get((service_name, api_version))
+        if cached is not None and cached[0] is self._credentials:
+            return cached[1]
         
         try:
-            client = build(service_name, api_version, credentials=self._credentials)
-            logger.info(f"Created {service_name} API client (v{api_version})")
+            from googleapiclient.discovery import build
+            
+            # Use the discovery documents bundled with googleapiclient; never fetch them.
+            # Clients share this thread's authorized HTTP client instead of each
+            # opening their own connections; execute() swaps in the caller's
+            # per-thread client when requests run on worker threads
+            client = build(service_name, api_version, http=self._authorized_http(), static_discovery=True)
+            self._client_cache[(service_name, api_version)] = (self._credentials, client)
+            logger.info(f"Created {service_name} API client ({api_version})")
             return client
             
         except Exception as e:
             logger.error(f"Failed to create {service_name} API client: {e}")
             raise
     
+    def _get_transport(self) -> 'Request':
+        """Get the transport used for token refresh and revocation.
+        
+        Returns:
+            Request transport whose session keeps the token endpoint
+            connection alive between calls
+        """
+        if self._transport is None:
+            import requests
+            from google.auth.transport.requests import Request
+            
+            self._transport = Request(session=requests.Session())
+        return self._transport
+    
+    def _authorized_http(self) -> 'AuthorizedHttp':
+        """Get the calling thread's authorized HTTP client for the current credentials.
+        
+        Returns:
+            AuthorizedHttp reused by this thread until the credentials change
+        """
+        http = getattr(self._http_local, 'http', None)
+        if http is None or http.credentials is not self._credentials:
+            import httplib2
+            from google_auth_httplib2 import AuthorizedHttp
+            
+            http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._http_local.http = http
+        return http
+    
+    def execute(self, request):
+        """Execute an API request on the calling thread's pooled HTTP client.
+        
+        Safe to call from worker threads; each thread reuses its own
+        keep-alive connections instead of opening a new one per request.
+        
+        Args:
+            request: HttpRequest built from a client returned by get_api_client
+            
+        Returns:
+            Decoded API response
+        """
+        return request.execute(http=self._authorized_http())
+    
+    def _revoke_token(self, token: str, request: 'Request') -> None:
+        """Revoke a token at Google's revocation endpoint (blocking).
+        
+        Args:
+            token: Refresh or access token to revoke
+            request: Transport used to send the request
+            
+        Raises:
+            RuntimeError: If Google rejects the revocation
+        """
+        response = request(
+            GoogleConfig.TOKEN_REVOKE_URI,
+            method='POST',
+            body=urlencode({'token': token}),
+            headers={'Content-Type': 'application/x-www-form-urlencoded'}
+        )
+        
+        # 400 means the token is already invalid or revoked, which is what we want
+        if response.status == 400:
+            logger.warning("Google reported the token as already invalid")
+        elif response.status != 200:
+            raise RuntimeError(f"Token revocation failed with HTTP {response.status}")
+    
     async def revoke_credentials(self) -> bool:
         """Revoke stored Google OAuth credentials.
         
@@ -226,13 +446,25 @@ class GoogleOAuthManager:
             True if revocation successful
         """
         try:
-            if self._credentials:
+            if self._refresh_task is not None:
+                self._refresh_task.cancel()
+            
+            # Revoking the refresh token revokes the whole grant; fall back to
+            # the access token, and to the stored credentials when none are loaded
+            if self._credentials is not None:
+                token = self._credentials.refresh_token or self._credentials.token
+            else:
+                stored = await self.credential_manager.get_credentials('google_oauth')
+                token = stored and (stored.get('refresh_token') or stored.get('token'))
+            
+            if token:
                 # Revoke token with Google
-                self._credentials.revoke(Request())
+                await self._call_token_endpoint(partial(self._revoke_token, token))
             
             # Remove stored credentials
             await self.credential_manager.delete_credentials('google_oauth')
             self._credentials = None
+            self._client_cache.clear()
             
             logger.info("Google OAuth credentials revoked")
             return True
@@ -254,7 +486,49 @@ class GoogleOAuthManager:
         if services is None:
             services = ['tasks', 'calendar', 'drive', 'docs']
         
-        return self.initialize_flow(services, redirect_uri)
+        auth_url = self.initialize_flow(services, redirect_uri)
+        
+        # The code may be exchanged by another process, which needs the same
+        # PKCE code verifier and state to complete the flow. This replaces the
+        # state of any earlier flow, whose code can no longer be exchanged
+        if not await self.credential_manager.store_credentials(_FLOW_STATE_KEY, self._flow_state):
+            raise RuntimeError("Failed to store OAuth flow state")
+        return auth_url
+    
+    async def _restore_flow(self):
+        """Rebuild the OAuth flow started by get_authorization_url.
+        
+        Returns:
+            The flow, or None if no flow was started
+        """
+        flow_state = await self.credential_manager.get_credentials(_FLOW_STATE_KEY)
+        if not flow_state:
+            return None
+        
+        from google_auth_oauthlib.flow import Flow
+        
+        return Flow.from_client_config(
+            self._client_config(),
+            scopes=flow_state['scopes'],
+            redirect_uri=flow_state['redirect_uri'],
+            state=flow_state['state'],
+            code_verifier=flow_state['code_verifier']
+        )
+    
+    async def _ensure_credentials(self) -> Optional['Credentials']:
+        """Load stored credentials if none are loaded yet.
+        
+        Returns:
+            The loaded credentials, or None if the user is not authenticated
+        """
+        if not self._credentials:
+            # Concurrent callers share one load instead of each decrypting the
+            # stored record (and possibly refreshing the token) themselves
+            task = self._load_task
+            if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+                task = self._load_task = asyncio.ensure_future(self.load_credentials())
+            await asyncio.shield(task)
+        return self._credentials
     
     async def is_authenticated(self) -> bool:
         """Check if user is currently authenticated with Google.
@@ -262,25 +536,23 @@ class GoogleOAuthManager:
         Returns:
             True if valid credentials are available
         """
-        # Load credentials if not already loaded
-        if not self._credentials:
-            await self.load_credentials()
-        
-        return self._credentials is not None and self._credentials.valid
+        credentials = await self._ensure_credentials()
+        return credentials is not None and credentials.valid
     
-    def get_user_info(self) -> Optional[Dict[str, Any]]:
+    async def get_user_info(self) -> Optional[Dict[str, Any]]:
         """Get basic user information from Google.
         
         Returns:
             User information dictionary or None if not authenticated
         """
-        if not self.is_authenticated():
+        if not await self.is_authenticated():
             return None
         
         try:
-            # Use OAuth2 API to get user info
-            oauth2_client = build('oauth2', 'v2', credentials=self._credentials)
-            user_info = oauth2_client.userinfo().get().execute()
+            # Use OAuth2 API to get user info; the request itself blocks, so
+            # run it on a worker thread instead of the event loop
+            oauth2_client = self.get_api_client('oauth2', 'v2')
+            user_info = await asyncio.to_thread(self.execute, oauth2_client.userinfo().get())
             
             return {
                 'id': user_info.get('id'),
@@ -293,50 +565,23 @@ class GoogleOAuthManager:
             logger.error(f"Failed to get user info: {e}")
             return None
     
-    async def get_tasks_service(self):
-        """Get authenticated Google Tasks API service.
-        
-        Returns:
-            Authenticated Google Tasks API client
-        """
-        # Ensure we have valid credentials
-        if not self._credentials:
-            await self.load_credentials()
-        
-        return self.get_api_client('tasks', 'v1')
-    
-    async def get_calendar_service(self):
-        """Get authenticated Google Calendar API service.
-        
-        Returns:
-            Authenticated Google Calendar API client
-        """
-        # Ensure we have valid credentials
-        if not self._credentials:
-            await self.load_credentials()
-        
-        return self.get_api_client('calendar', 'v3')
-    
-    async def get_drive_service(self):
-        """Get authenticated Google Drive API service.
+    async def service(self, name: str):
+        """Get an authenticated Google API service.
         
+        Args:
+            name: Service name ('tasks', 'calendar', 'drive', 'docs')
+            
         Returns:
-            Authenticated Google Drive API client
+            Authenticated Google API client, at the service's default version
         """
-        # Ensure we have valid credentials
-        if not self._credentials:
-            await self.load_credentials()
+        version = _DEFAULT_VERSIONS.get(name)
+        if version is None:
+            raise ValueError(f"Unknown service: {name}")
         
-        return self.get_api_client('drive', 'v3')
+        await self._ensure_credentials()
+        return self.get_api_client(name, version)
     
-    async def get_docs_service(self):
-        """Get authenticated Google Docs API service.
-        
-        Returns:
-            Authenticated Google Docs API client
-        """
-        # Ensure we have valid credentials
-        if not self._credentials:
-            await self.load_credentials()
-        
-        return self.get_api_client('docs', 'v1')
\ No newline at end of file
+    get_tasks_service = partialmethod(service, 'tasks')
+    get_calendar_service = partialmethod(service, 'calendar')
+    get_drive_service = partialmethod(service, 'drive')
+    get_docs_service = partialmethod(service, 'docs')
\ No newline at end of file
@@ -1,18 +1,17 @@
+"""Revoke and remove the stored Google OAuth credentials.
+
+Run from the voice-assistant/src directory as a module so the package
+imports resolve without touching sys.path:
+
+    python -m auth.logout_google_script
+"""
 import asyncio
+import json
 import sys
-import os
 
-# Add the parent directory (src) to sys.path to allow imports from other packages like 'auth'
-# This assumes the script is in voice-assistant/src/auth/
-# and google_oauth.py is in voice-assistant/src/auth/
-# and credential_manager.py is in voice-assistant/src/auth/
-# Adjust if your structure is different.
-current_dir = os.path.dirname(os.path.abspath(__file__))
-src_dir = os.path.dirname(current_dir) # This should be the 'src' directory
-sys.path.insert(0, src_dir)
+from loguru import logger
 
-from auth.google_oauth import GoogleOAuthManager # Adjusted import path
-from utils.logger import logger # Assuming logger is in src/utils
+from .google_oauth import GoogleOAuthManager
 
 async def main():
     """Performs the Google OAuth logout operation."""
@@ -20,23 +19,24 @@ async def main():
         # The client_secrets_path will be resolved by GoogleOAuthManager default constructor
         # to voice-assistant/config/google_client_secrets.json
         oauth_manager = GoogleOAuthManager()
-        success = await oauth_manager.logout()
+        success = await oauth_manager.revoke_credentials()
         
         if success:
             logger.info("Logout script: Logout successful.")
-            print("{\"success\": true}") # Output JSON for Electron to parse
+            sys.stdout.write(json.dumps({"success": True})) # Output JSON for Electron to parse
         else:
             logger.error("Logout script: Logout failed.")
-            print("{\"success\": false, \"error\": \"Logout operation failed in Python script.\"}")
+            sys.stdout.write(json.dumps({"success": False, "error": "Logout operation failed in Python script."}))
             sys.exit(1) # Indicate failure with a non-zero exit code
             
     except Exception as e:
         logger.error(f"Logout script: An error occurred: {e}")
-        # Ensure to print JSON even on unexpected error for Electron to handle gracefully
-        print(f"{{\"success\": false, \"error\": \"An unexpected error occurred: {str(e).replace('"', '\\\"')}\"}}")
+        # Ensure to print JSON even on unexpected error for Electron to handle gracefully;
+        # json.dumps escapes quotes, backslashes and control characters in the message
+        sys.stdout.write(json.dumps({"success": False, "error": f"An unexpected error occurred: {e}"}))
         sys.exit(1) # Indicate failure
+    finally:
+        sys.stdout.flush()
 
 if __name__ == "__main__":
-    # Ensure the script is run from a context where it can find its modules.
-    # The CWD for execFile in main.js is set to src/auth, which should be fine.
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -17,7 +17,9 @@ async def main():
     auth_code = sys.argv[1]
     manager = GoogleOAuthManager()
     try:
-        success = await manager.handle_callback(auth_code, redirect_uri='http://localhost:8080/oauth/callback')
+        # Completes the flow started by get_authorization_url, reusing its
+        # stored PKCE code verifier and redirect URI
+        success = await manager.handle_callback(auth_code)
         if success:
             print("SUCCESS")
         else:
@@ -26,4 +28,4 @@ async def main():
         print(f"FAILURE: {str(e)}")
 
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
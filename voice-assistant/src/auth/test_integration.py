@@ -50,6 +50,10 @@ class GoogleIntegrationTest:
             level="INFO"
         )
     
+    async def _execute(self, request):
+        """Execute an API request on a worker thread so tests can run concurrently."""
+        return await asyncio.to_thread(self.oauth_manager.execute, request)
+    
     async def test_configuration(self) -> bool:
         """Test OAuth configuration validity."""
         logger.info("Testing OAuth configuration...")
@@ -109,10 +113,6 @@ class GoogleIntegrationTest:
         logger.info("Testing user info retrieval...")
         
         try:
-            if not await self.oauth_manager.is_authenticated():
-                logger.warning("Not authenticated - skipping user info test")
-                return True
-            
             user_info = await self.oauth_manager.get_user_info()
             
             if user_info and 'email' in user_info:
@@ -131,15 +131,11 @@ class GoogleIntegrationTest:
         logger.info("Testing Google Tasks API...")
         
         try:
-            if not await self.oauth_manager.is_authenticated():
-                logger.warning("Not authenticated - skipping Tasks API test")
-                return True
-            
             # Get Tasks service
             tasks_service = await self.oauth_manager.get_tasks_service()
             
             # List task lists
-            task_lists = tasks_service.tasklists().list().execute()
+            task_lists = await self._execute(tasks_service.tasklists().list())
             
             if 'items' in task_lists:
                 logger.success(f"✓ Tasks API working - found {len(task_lists['items'])} task lists")
@@ -154,18 +150,18 @@ class GoogleIntegrationTest:
                         'notes': 'This task was created by the integration test'
                     }
                     
-                    created_task = tasks_service.tasks().insert(
+                    created_task = await self._execute(tasks_service.tasks().insert(
                         tasklist=default_list,
                         body=test_task
-                    ).execute()
+                    ))
                     
                     logger.success(f"✓ Test task created: {created_task['title']}")
                     
                     # Clean up - delete the test task
-                    tasks_service.tasks().delete(
+                    await self._execute(tasks_service.tasks().delete(
                         tasklist=default_list,
                         task=created_task['id']
-                    ).execute()
+                    ))
                     
                     logger.info("✓ Test task cleaned up")
                 
@@ -183,30 +179,36 @@ class GoogleIntegrationTest:
         logger.info("Testing Google Calendar API...")
         
         try:
-            if not await self.oauth_manager.is_authenticated():
-                logger.warning("Not authenticated - skipping Calendar API test")
-                return True
-            
             # Get Calendar service
             calendar_service = await self.oauth_manager.get_calendar_service()
             
-            # List calendars
-            calendars = calendar_service.calendarList().list().execute()
+            # Listing calendars and upcoming primary-calendar events are
+            # independent, so send both in one batch request
+            responses = {}
+            
+            def collect(request_id, response, exception):
+                if exception is not None:
+                    raise exception
+                responses[request_id] = response
+            
+            now = datetime.utcnow().isoformat() + 'Z'
+            batch = calendar_service.new_batch_http_request(callback=collect)
+            batch.add(calendar_service.calendarList().list(), request_id='calendars')
+            batch.add(calendar_service.events().list(
+                calendarId='primary',
+                timeMin=now,
+                maxResults=10,
+                singleEvents=True,
+                orderBy='startTime'
+            ), request_id='events')
+            await self._execute(batch)
+            
+            calendars = responses['calendars']
             
             if 'items' in calendars:
                 logger.success(f"✓ Calendar API working - found {len(calendars['items'])} calendars")
                 
-                # Test listing events from primary calendar
-                now = datetime.utcnow().isoformat() + 'Z'
-                events_result = calendar_service.events().list(
-                    calendarId='primary',
-                    timeMin=now,
-                    maxResults=10,
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
-                
-                events = events_result.get('items', [])
+                events = responses['events'].get('items', [])
                 logger.success(f"✓ Found {len(events)} upcoming events")
                 
                 return True
@@ -223,18 +225,14 @@ class GoogleIntegrationTest:
         logger.info("Testing Google Drive API...")
         
         try:
-            if not await self.oauth_manager.is_authenticated():
-                logger.warning("Not authenticated - skipping Drive API test")
-                return True
-            
             # Get Drive service
             drive_service = await self.oauth_manager.get_drive_service()
             
             # List files (first 10)
-            results = drive_service.files().list(
+            results = await self._execute(drive_service.files().list(
                 pageSize=10,
                 fields="nextPageToken, files(id, name, mimeType)"
-            ).execute()
+            ))
             
             files = results.get('files', [])
             
@@ -256,10 +254,6 @@ class GoogleIntegrationTest:
         logger.info("Testing Google Docs API...")
         
         try:
-            if not await self.oauth_manager.is_authenticated():
-                logger.warning("Not authenticated - skipping Docs API test")
-                return True
-            
             # Get Docs service
             docs_service = await self.oauth_manager.get_docs_service()
             
@@ -322,38 +316,62 @@ class GoogleIntegrationTest:
             logger.error(f"Credential management test failed: {e}")
             return False
     
+    async def _run_test(self, test_name: str, test_func) -> bool:
+        """Run one test, turning an unexpected exception into a failure."""
+        logger.info(f"\nRunning {test_name} test...")
+        try:
+            result = await test_func()
+            
+            if result:
+                logger.success(f"✓ {test_name} test passed")
+            else:
+                logger.error(f"✗ {test_name} test failed")
+            return result
+            
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed with exception: {e}")
+            return False
+    
     async def run_all_tests(self) -> bool:
         """Run all integration tests."""
         logger.info("Starting Google OAuth Integration Tests")
         logger.info("=" * 50)
         
-        tests = [
+        # Configuration and authentication gate everything else, so run them first
+        prelude = [
             ("Configuration", self.test_configuration),
-            ("Authentication Flow", self.test_authentication_flow),
+            ("Authentication Flow", self.test_authentication_flow)
+        ]
+        
+        # Tests that call Google APIs and need stored credentials
+        api_tests = [
             ("User Info", self.test_user_info),
             ("Tasks API", self.test_tasks_api),
             ("Calendar API", self.test_calendar_api),
             ("Drive API", self.test_drive_api),
-            ("Docs API", self.test_docs_api),
-            ("Credential Management", self.test_credential_management)
+            ("Docs API", self.test_docs_api)
         ]
         
         results = []
         
-        for test_name, test_func in tests:
-            logger.info(f"\nRunning {test_name} test...")
-            try:
-                result = await test_func()
-                results.append((test_name, result))
-                
-                if result:
-                    logger.success(f"✓ {test_name} test passed")
-                else:
-                    logger.error(f"✗ {test_name} test failed")
-                    
-            except Exception as e:
-                logger.error(f"✗ {test_name} test failed with exception: {e}")
-                results.append((test_name, False))
+        for test_name, test_func in prelude:
+            results.append((test_name, await self._run_test(test_name, test_func)))
+        
+        # Check authentication once for all API tests; without it they are skipped
+        concurrent_tests = [("Credential Management", self.test_credential_management)]
+        if await self.oauth_manager.is_authenticated():
+            concurrent_tests[:0] = api_tests
+        else:
+            for test_name, _ in api_tests:
+                logger.warning(f"Not authenticated - skipping {test_name} test")
+                results.append((test_name, True))
+        
+        # The remaining tests are independent of each other and mostly wait on
+        # the network, so run them concurrently
+        outcomes = await asyncio.gather(
+            *(self._run_test(test_name, test_func) for test_name, test_func in concurrent_tests)
+        )
+        results.extend(zip((test_name for test_name, _ in concurrent_tests), outcomes))
         
         # Summary
         logger.info("\n" + "=" * 50)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Electron auth handler
+
+These tests verify request handling without starting Electron or calling
+Google APIs.
+"""
+
+import asyncio
+import json
+import os
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from .. import electron_auth_handler
+from ..electron_auth_handler import ElectronAuthHandler
+
+
+class TestElectronAuthHandler(unittest.IsolatedAsyncioTestCase):
+    """Test cases for ElectronAuthHandler request handling."""
+
+    def setUp(self):
+        """Set up test environment."""
+        # Mock OAuth manager; the real one (and its credential store) is never built
+        self.oauth_manager_mock = MagicMock()
+        with patch.object(electron_auth_handler, 'GoogleOAuthManager', return_value=self.oauth_manager_mock), \
+             patch.object(electron_auth_handler, 'CredentialManager'):
+            self.handler = ElectronAuthHandler()
+
+    async def test_revoke_auth(self):
+        """Test revoking authentication."""
+        self.oauth_manager_mock.revoke_credentials = AsyncMock(return_value=True)
+        self.handler._auth_cache = (float('inf'), {'success': True, 'authenticated': True})
+
+        response = await self.handler.handle_request({'type': 'revoke_auth'})
+
+        self.assertTrue(response['success'])
+        self.assertEqual(self.handler._auth_cache, (0.0, None))
+
+    async def test_revoke_auth_failure(self):
+        """Test a failed revocation is reported to Electron."""
+        self.oauth_manager_mock.revoke_credentials = AsyncMock(return_value=False)
+
+        response = await self.handler.handle_request({'type': 'revoke_auth'})
+
+        self.assertFalse(response['success'])
+        self.assertIn('error', response)
+
+    async def test_check_status_cached(self):
+        """Test a recent authenticated status is reused."""
+        self.oauth_manager_mock.is_authenticated = AsyncMock(return_value=True)
+        self.oauth_manager_mock.get_user_info = AsyncMock(return_value={'email': 'user@example.com'})
+
+        first = await self.handler.handle_request({'type': 'check_status'})
+        second = await self.handler.handle_request({'type': 'check_status'})
+
+        self.assertTrue(first['authenticated'])
+        self.assertEqual(second, first)
+        self.oauth_manager_mock.is_authenticated.assert_awaited_once()
+
+    async def test_check_status_not_authenticated_not_cached(self):
+        """Test a signed-out status is checked again on the next poll."""
+        self.oauth_manager_mock.is_authenticated = AsyncMock(return_value=False)
+
+        await self.handler.handle_request({'type': 'check_status'})
+        await self.handler.handle_request({'type': 'check_status'})
+
+        self.assertEqual(self.oauth_manager_mock.is_authenticated.await_count, 2)
+
+    async def test_batch_route_rejects_bad_ids(self):
+        """Test a batch request needs a non-empty list of string ids."""
+        for ids in ('abc', [], ['task-1', ''], ['task-1', 2], None):
+            response = await self.handler.handle_request({'type': 'tasks_batch_delete', 'params': {'ids': ids}})
+
+            self.assertFalse(response['success'], ids)
+        self.oauth_manager_mock.execute.assert_not_called()
+
+
+def _frame(body: bytes) -> bytes:
+    """Prefix a request body with its little-endian length."""
+    return struct.pack('<I', len(body)) + body
+
+
+def _parse_frames(data: bytes) -> list:
+    """Split response bytes into decoded JSON frames."""
+    responses = []
+    while data:
+        (length,) = struct.unpack('<I', data[:4])
+        responses.append(json.loads(data[4:4 + length]))
+        data = data[4 + length:]
+    return responses
+
+
+class TestFrameProtocol(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the length-prefixed IPC framing."""
+
+    def setUp(self):
+        """Set up test environment."""
+        with patch.object(electron_auth_handler, 'GoogleOAuthManager'), \
+             patch.object(electron_auth_handler, 'CredentialManager'):
+            self.handler = ElectronAuthHandler()
+        self.writes = []
+
+    async def _serve(self, *bodies: bytes, drain=None) -> list:
+        """Serve request bodies through _serve_frames and return the responses."""
+        reader = asyncio.StreamReader()
+        reader.feed_data(b''.join(_frame(body) for body in bodies))
+        reader.feed_eof()
+
+        await self.handler._serve_frames(reader, self.writes.append, drain)
+        return _parse_frames(b''.join(self.writes))
+
+    async def test_round_trip(self):
+        """Test each request is answered with its id echoed."""
+        responses = await self._serve(
+            json.dumps({'id': 1, 'type': 'unknown_a'}).encode(),
+            json.dumps({'id': 'two', 'type': 'unknown_b'}).encode()
+        )
+
+        by_id = {response['id']: response for response in responses}
+        self.assertEqual(set(by_id), {1, 'two'})
+        self.assertEqual(by_id[1]['error'], 'Unknown request type: unknown_a')
+        self.assertFalse(by_id['two']['success'])
+
+    async def test_concurrent_requests_answer_out_of_order(self):
+        """Test a slow request doesn't hold back a fast one."""
+        release = asyncio.Event()
+
+        async def handle_request(request_data):
+            if request_data['type'] == 'slow':
+                await release.wait()
+            else:
+                release.set()
+            return {'success': True, 'type': request_data['type']}
+
+        with patch.object(self.handler, 'handle_request', side_effect=handle_request):
+            responses = await self._serve(
+                json.dumps({'id': 1, 'type': 'slow'}).encode(),
+                json.dumps({'id': 2, 'type': 'fast'}).encode()
+            )
+
+        self.assertEqual([response['id'] for response in responses], [2, 1])
+
+    async def test_responses_batched_into_one_write(self):
+        """Test responses finished together are sent in a single write."""
+        responses = await self._serve(*(
+            json.dumps({'id': i, 'type': 'unknown'}).encode() for i in range(5)
+        ))
+
+        self.assertEqual(len(responses), 5)
+        self.assertEqual(len(self.writes), 1)
+
+    async def test_malformed_request_keeps_id(self):
+        """Test a request that isn't valid JSON is answered with its id."""
+        responses = await self._serve(b'{"id": 9, "type": oops')
+
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(responses[0]['id'], 9)
+        self.assertFalse(responses[0]['success'])
+        self.assertTrue(responses[0]['error'].startswith('Invalid request'))
+
+    async def test_drain_after_write(self):
+        """Test socket writes wait for the client to take the data."""
+        drain = AsyncMock()
+
+        await self._serve(json.dumps({'id': 1, 'type': 'unknown'}).encode(), drain=drain)
+
+        self.assertEqual(len(self.writes), 1)
+        drain.assert_awaited_once()
+
+    async def test_socket_round_trip(self):
+        """Test requests and responses over a real stream connection."""
+        server = await asyncio.start_server(self.handler._handle_client, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(_frame(json.dumps({'id': 3, 'type': 'unknown'}).encode()))
+            await writer.drain()
+
+            (length,) = struct.unpack('<I', await reader.readexactly(4))
+            response = json.loads(await reader.readexactly(length))
+            writer.close()
+            await writer.wait_closed()
+
+        self.assertEqual(response['id'], 3)
+        self.assertFalse(response['success'])
+
+
+class TestErrorResponses(unittest.TestCase):
+    """Test cases for failure responses."""
+
+    def test_error_response_not_shared(self):
+        """Test each failure response is a separate dict."""
+        first = electron_auth_handler._error_response('boom')
+        first['id'] = 1
+
+        second = electron_auth_handler._error_response('boom')
+
+        self.assertEqual(second, {'success': False, 'error': 'boom'})
+
+    def test_fixed_responses_not_shared(self):
+        """Test fixed responses are copied before they are returned."""
+        with patch.object(electron_auth_handler, 'GoogleOAuthManager'), \
+             patch.object(electron_auth_handler, 'CredentialManager'):
+            handler = ElectronAuthHandler()
+        handler.oauth_manager.is_authenticated = AsyncMock(return_value=False)
+
+        first = asyncio.run(handler.handle_request({'type': 'check_status'}))
+        first['id'] = 1
+
+        self.assertNotIn('id', electron_auth_handler._NOT_AUTHENTICATED)
+
+    def test_salvage_request_id(self):
+        """Test a leading id is found in malformed request bodies."""
+        salvage = electron_auth_handler._salvage_request_id
+
+        self.assertEqual(salvage(b'{"id": 7, "type": oops}'), 7)
+        self.assertEqual(salvage(b' {"id":"req-2",'), 'req-2')
+        self.assertIsNone(salvage(b'{"params": {"id": "task-1"}'))
+        self.assertIsNone(salvage(b'{x]'))
+
+
+@unittest.skipIf(os.name == 'nt', "Unix sockets only")
+class TestSocketDirectory(unittest.TestCase):
+    """Test cases for the IPC socket directory check."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_creates_private_dir(self):
+        """Test a missing directory is created owner-only."""
+        socket_dir = Path(self.temp_dir.name) / "ipc"
+
+        electron_auth_handler._ensure_private_dir(socket_dir)
+
+        self.assertEqual(os.stat(socket_dir).st_mode & 0o777, 0o700)
+
+    def test_rejects_shared_dir(self):
+        """Test an existing directory others can enter is refused."""
+        socket_dir = Path(self.temp_dir.name) / "ipc"
+        socket_dir.mkdir(mode=0o755)
+        os.chmod(socket_dir, 0o755)
+
+        with self.assertRaises(PermissionError):
+            electron_auth_handler._ensure_private_dir(socket_dir)
+
+    def test_rejects_symlink(self):
+        """Test a symlink to a directory is refused."""
+        target = Path(self.temp_dir.name) / "target"
+        target.mkdir(mode=0o700)
+        socket_dir = Path(self.temp_dir.name) / "ipc"
+        socket_dir.symlink_to(target)
+
+        with self.assertRaises(PermissionError):
+            electron_auth_handler._ensure_private_dir(socket_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
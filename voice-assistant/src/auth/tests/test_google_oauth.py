@@ -8,88 +8,151 @@ without requiring actual Google API calls.
 
 import asyncio
 import json
-import os
+import shutil
 import sys
+import tempfile
 import unittest
+from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch, mock_open
+from uuid import uuid4
+from unittest.mock import MagicMock, patch
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from .. import google_oauth
 from ..google_oauth import GoogleOAuthManager
 from ..credential_manager import CredentialManager
 
 
-class TestGoogleOAuthManager(unittest.TestCase):
+class TestGoogleOAuthManager(unittest.IsolatedAsyncioTestCase):
     """Test cases for GoogleOAuthManager class."""
 
-    def setUp(self):
-        """Set up test environment."""
+    # Mock client secrets file (read-only, shared by all tests)
+    mock_client_secrets = {
+        "installed": {
+            "client_id": "test-client-id",
+            "project_id": "test-project",
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+            "client_secret": "test-client-secret",
+            "redirect_uris": ["http://localhost:8080/callback"]
+        }
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up environment shared by all tests in the class."""
         # Mock environment variables
-        self.env_patcher = patch.dict('os.environ', {
+        cls.env_patcher = patch.dict('os.environ', {
             'GOOGLE_CLIENT_ID': 'test-client-id',
             'GOOGLE_CLIENT_SECRET': 'test-client-secret'
         })
-        self.env_patcher.start()
-        
+        cls.env_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up shared environment."""
+        cls.env_patcher.stop()
+
+    def setUp(self):
+        """Set up test environment."""
         # Mock credential manager
         self.credential_manager_mock = MagicMock(spec=CredentialManager)
         
-        # Create test instance with mocked dependencies
-        self.oauth_manager = GoogleOAuthManager()
-        self.oauth_manager.credential_manager = self.credential_manager_mock
-        
-        # Mock client secrets file
-        self.mock_client_secrets = {
-            "installed": {
-                "client_id": "test-client-id",
-                "project_id": "test-project",
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-                "client_secret": "test-client-secret",
-                "redirect_uris": ["http://localhost:8080/callback"]
-            }
-        }
-
-    def tearDown(self):
-        """Clean up after tests."""
-        self.env_patcher.stop()
+        # Create test instance with mocked dependencies; each test gets its
+        # own manager since tests set credentials and flow state on it. The
+        # real CredentialManager (keyring, storage directory) is never built
+        with patch.object(google_oauth, 'CredentialManager', return_value=self.credential_manager_mock):
+            self.oauth_manager = GoogleOAuthManager()
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('json.load')
-    @patch('google_auth_oauthlib.flow.Flow.from_client_secrets_file')
-    async def test_get_authorization_url(self, mock_flow_from_file, mock_json_load, mock_file):
+    async def test_get_authorization_url(self):
         """Test generating authorization URL."""
-        # Setup mocks
-        mock_json_load.return_value = self.mock_client_secrets
+        # Setup mock: serve the client secrets from memory; Flow itself is
+        # real and builds the URL offline
+        with patch.object(self.oauth_manager, '_client_config', return_value=self.mock_client_secrets):
+            # Call method
+            auth_url = await self.oauth_manager.get_authorization_url()
         
-        mock_flow = MagicMock()
-        mock_flow.authorization_url.return_value = ('https://test-auth-url', 'test-state')
-        mock_flow_from_file.return_value = mock_flow
+        # Assertions
+        self.assertTrue(auth_url.startswith('https://accounts.google.com/o/oauth2/auth?'))
+        self.assertIn('client_id=test-client-id', auth_url)
+        self.assertIn('access_type=offline', auth_url)
+        
+        # The flow state is stored for whichever process receives the code
+        key, flow_state = self.credential_manager_mock.store_credentials.call_args.args
+        self.assertEqual(key, 'google_oauth_flow')
+        self.assertEqual(flow_state['code_verifier'], self.oauth_manager.flow.code_verifier)
+        self.assertIn(f"state={flow_state['state']}", auth_url)
+
+    async def test_handle_callback_in_new_process(self):
+        """Test a fresh manager completes the flow started by another one."""
+        from google_auth_oauthlib.flow import Flow
+        
+        # Start the flow and keep the state it stored
+        with patch.object(self.oauth_manager, '_client_config', return_value=self.mock_client_secrets):
+            await self.oauth_manager.get_authorization_url()
+        flow_state = self.credential_manager_mock.store_credentials.call_args.args[1]
+        
+        # A second manager, as in submit_auth_code_script, reads it back
+        with patch.object(google_oauth, 'CredentialManager', return_value=self.credential_manager_mock):
+            new_manager = GoogleOAuthManager()
+        self.credential_manager_mock.get_credentials.return_value = flow_state
+        
+        def fetch_token(flow, code):
+            # The token request must carry the original PKCE verifier
+            self.assertEqual(flow.code_verifier, flow_state['code_verifier'])
+            flow.oauth2session.token = {'access_token': 'test-token', 'token_type': 'Bearer', 'expires_at': 4102444800}
         
         # Call method
-        auth_url = await self.oauth_manager.get_authorization_url()
+        with patch.object(new_manager, '_client_config', return_value=self.mock_client_secrets), \
+             patch.object(Flow, 'fetch_token', autospec=True, side_effect=fetch_token):
+            result = await new_manager.handle_callback('test-code')
         
-        # Assertions
-        self.assertEqual(auth_url, 'https://test-auth-url')
-        mock_flow.authorization_url.assert_called_once()
+        # Assertions: the code was exchanged and the single-use state removed
+        self.assertTrue(result)
+        self.assertEqual(new_manager._credentials.token, 'test-token')
+        self.credential_manager_mock.delete_credentials.assert_called_once_with('google_oauth_flow')
+
+    async def test_auth_url_script_flow_completed_by_new_manager(self):
+        """Test a flow started by get_auth_url_script is completed by a new manager."""
+        from google_auth_oauthlib.flow import Flow
+        from .. import get_auth_url_script
+        
+        # Start two flows as the script does; the second replaces the first
+        with patch.object(google_oauth, 'CredentialManager', return_value=self.credential_manager_mock), \
+             patch.object(GoogleOAuthManager, '_client_config', return_value=self.mock_client_secrets), \
+             patch('builtins.print'):
+            await get_auth_url_script.main()
+            first_state = self.credential_manager_mock.store_credentials.call_args.args[1]
+            await get_auth_url_script.main()
+        key, flow_state = self.credential_manager_mock.store_credentials.call_args.args
+        self.assertEqual(key, 'google_oauth_flow')
+        self.assertNotEqual(flow_state['code_verifier'], first_state['code_verifier'])
+        
+        # A new manager, as in submit_auth_code_script, completes the latest flow
+        with patch.object(google_oauth, 'CredentialManager', return_value=self.credential_manager_mock):
+            new_manager = GoogleOAuthManager()
+        self.credential_manager_mock.get_credentials.return_value = flow_state
+        
+        def fetch_token(flow, code):
+            self.assertEqual(flow.code_verifier, flow_state['code_verifier'])
+            flow.oauth2session.token = {'access_token': 'test-token', 'token_type': 'Bearer', 'expires_at': 4102444800}
+        
+        with patch.object(new_manager, '_client_config', return_value=self.mock_client_secrets), \
+             patch.object(Flow, 'fetch_token', autospec=True, side_effect=fetch_token):
+            result = await new_manager.handle_callback('test-code')
+        
+        self.assertTrue(result)
+        self.credential_manager_mock.delete_credentials.assert_called_once_with('google_oauth_flow')
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('json.load')
-    @patch('google_auth_oauthlib.flow.Flow.from_client_secrets_file')
-    async def test_handle_callback(self, mock_flow_from_file, mock_json_load, mock_file):
+    async def test_handle_callback(self):
         """Test handling OAuth callback."""
-        # Setup mocks
-        mock_json_load.return_value = self.mock_client_secrets
-        
+        # Setup mocks: handle_callback continues a flow started by initialize_flow
         mock_flow = MagicMock()
-        mock_credentials = MagicMock()
-        mock_credentials.to_json.return_value = '{"token": "test-token"}'
-        mock_flow.fetch_token.return_value = mock_credentials
-        mock_flow_from_file.return_value = mock_flow
+        self.oauth_manager.flow = mock_flow
         
         # Call method
         result = await self.oauth_manager.handle_callback('test-code')
@@ -101,253 +164,414 @@ class TestGoogleOAuthManager(unittest.TestCase):
 
     async def test_is_authenticated(self):
         """Test checking authentication status."""
-        # Setup mock
-        self.credential_manager_mock.is_authenticated.return_value = True
+        # Setup mock: a stored token that is valid for another hour
+        self.credential_manager_mock.get_credentials.return_value = {
+            'token': 'test-token',
+            'token_uri': 'https://oauth2.googleapis.com/token',
+            'client_id': 'test-client-id',
+            'client_secret': 'test-client-secret',
+            'expiry': (datetime.utcnow() + timedelta(hours=1)).isoformat()
+        }
         
         # Call method
         result = await self.oauth_manager.is_authenticated()
         
         # Assertions
         self.assertTrue(result)
-        self.credential_manager_mock.is_authenticated.assert_called_once_with('google')
+        self.credential_manager_mock.get_credentials.assert_called_once_with('google_oauth')
 
     @patch('googleapiclient.discovery.build')
     async def test_get_tasks_service(self, mock_build):
         """Test getting Tasks API service."""
         # Setup mocks
         mock_credentials = MagicMock()
-        self.credential_manager_mock.load_credentials.return_value = mock_credentials
+        self.oauth_manager._credentials = mock_credentials
         mock_service = MagicMock()
         mock_build.return_value = mock_service
         
         # Call method
         result = await self.oauth_manager.get_tasks_service()
         
-        # Assertions
+        # Assertions: built on the shared authorized HTTP client
         self.assertEqual(result, mock_service)
-        mock_build.assert_called_once_with('tasks', 'v1', credentials=mock_credentials)
+        mock_build.assert_called_once_with(
+            'tasks', 'v1', http=self.oauth_manager._authorized_http(), static_discovery=True
+        )
 
     @patch('googleapiclient.discovery.build')
     async def test_get_calendar_service(self, mock_build):
         """Test getting Calendar API service."""
         # Setup mocks
         mock_credentials = MagicMock()
-        self.credential_manager_mock.load_credentials.return_value = mock_credentials
+        self.oauth_manager._credentials = mock_credentials
         mock_service = MagicMock()
         mock_build.return_value = mock_service
         
         # Call method
         result = await self.oauth_manager.get_calendar_service()
         
-        # Assertions
+        # Assertions: built on the shared authorized HTTP client
         self.assertEqual(result, mock_service)
-        mock_build.assert_called_once_with('calendar', 'v3', credentials=mock_credentials)
+        mock_build.assert_called_once_with(
+            'calendar', 'v3', http=self.oauth_manager._authorized_http(), static_discovery=True
+        )
 
     @patch('googleapiclient.discovery.build')
     async def test_get_drive_service(self, mock_build):
         """Test getting Drive API service."""
         # Setup mocks
         mock_credentials = MagicMock()
-        self.credential_manager_mock.load_credentials.return_value = mock_credentials
+        self.oauth_manager._credentials = mock_credentials
         mock_service = MagicMock()
         mock_build.return_value = mock_service
         
         # Call method
         result = await self.oauth_manager.get_drive_service()
         
-        # Assertions
+        # Assertions: built on the shared authorized HTTP client
         self.assertEqual(result, mock_service)
-        mock_build.assert_called_once_with('drive', 'v3', credentials=mock_credentials)
+        mock_build.assert_called_once_with(
+            'drive', 'v3', http=self.oauth_manager._authorized_http(), static_discovery=True
+        )
 
     @patch('googleapiclient.discovery.build')
     async def test_get_docs_service(self, mock_build):
         """Test getting Docs API service."""
         # Setup mocks
         mock_credentials = MagicMock()
-        self.credential_manager_mock.load_credentials.return_value = mock_credentials
+        self.oauth_manager._credentials = mock_credentials
         mock_service = MagicMock()
         mock_build.return_value = mock_service
         
         # Call method
         result = await self.oauth_manager.get_docs_service()
         
-        # Assertions
+        # Assertions: built on the shared authorized HTTP client
         self.assertEqual(result, mock_service)
-        mock_build.assert_called_once_with('docs', 'v1', credentials=mock_credentials)
+        mock_build.assert_called_once_with(
+            'docs', 'v1', http=self.oauth_manager._authorized_http(), static_discovery=True
+        )
 
     async def test_revoke_credentials(self):
         """Test revoking credentials."""
-        # Setup mock
+        from google.oauth2.credentials import Credentials
+        
+        # Setup mocks: real credentials, fake HTTP transport
         self.credential_manager_mock.delete_credentials.return_value = True
+        self.oauth_manager._credentials = Credentials(token='access-token', refresh_token='refresh-token')
+        transport = MagicMock(return_value=MagicMock(status=200))
+        
+        # Call method
+        with patch.object(self.oauth_manager, '_get_transport', return_value=transport):
+            result = await self.oauth_manager.revoke_credentials()
+        
+        # Assertions: the refresh token is posted to the revocation endpoint
+        self.assertTrue(result)
+        transport.assert_called_once_with(
+            'https://oauth2.googleapis.com/revoke',
+            method='POST',
+            body='token=refresh-token',
+            headers={'Content-Type': 'application/x-www-form-urlencoded'}
+        )
+        self.credential_manager_mock.delete_credentials.assert_called_once_with('google_oauth')
+        self.assertIsNone(self.oauth_manager._credentials)
+
+    async def test_revoke_stored_credentials(self):
+        """Test revoking credentials that were never loaded."""
+        # Setup mocks
+        self.credential_manager_mock.get_credentials.return_value = {'token': 'access-token'}
+        transport = MagicMock(return_value=MagicMock(status=200))
         
         # Call method
-        result = await self.oauth_manager.revoke_credentials()
+        with patch.object(self.oauth_manager, '_get_transport', return_value=transport):
+            result = await self.oauth_manager.revoke_credentials()
         
         # Assertions
         self.assertTrue(result)
-        self.credential_manager_mock.delete_credentials.assert_called_once_with('google')
+        self.assertEqual(transport.call_args.kwargs['body'], 'token=access-token')
+        self.credential_manager_mock.delete_credentials.assert_called_once_with('google_oauth')
+
+    async def test_revoke_credentials_rejected(self):
+        """Test revocation failure keeps the stored credentials."""
+        from google.oauth2.credentials import Credentials
+        
+        # Setup mocks
+        self.oauth_manager._credentials = Credentials(token='access-token')
+        transport = MagicMock(return_value=MagicMock(status=503))
+        
+        # Call method
+        with patch.object(self.oauth_manager, '_get_transport', return_value=transport):
+            result = await self.oauth_manager.revoke_credentials()
+        
+        # Assertions
+        self.assertFalse(result)
+        self.credential_manager_mock.delete_credentials.assert_not_called()
+
+    def _stored_credentials(self, expires_in: timedelta) -> dict:
+        """Stored credential record whose token expires after expires_in."""
+        expiry = datetime.utcnow() + expires_in
+        return {
+            'token': 'test-token',
+            'refresh_token': 'test-refresh-token',
+            'token_uri': 'https://oauth2.googleapis.com/token',
+            'client_id': 'test-client-id',
+            'client_secret': 'test-client-secret',
+            'scopes': ['openid'],
+            'expiry': expiry.isoformat()
+        }
+
+    async def test_load_credentials_refreshes_expired_token(self):
+        """Test an expired token is refreshed before credentials are returned."""
+        self.credential_manager_mock.get_credentials.return_value = self._stored_credentials(timedelta(hours=-1))
+        
+        with patch.object(self.oauth_manager, '_refresh_credentials') as mock_refresh:
+            credentials = await self.oauth_manager.load_credentials()
+        
+        self.assertEqual(credentials.token, 'test-token')
+        mock_refresh.assert_awaited_once()
+        self.assertIsNone(self.oauth_manager._refresh_task)
+
+    async def test_load_credentials_refreshes_in_background(self):
+        """Test a token close to expiry is returned now and refreshed in the background."""
+        self.credential_manager_mock.get_credentials.return_value = self._stored_credentials(timedelta(minutes=4, seconds=30))
+        
+        with patch.object(self.oauth_manager, '_refresh_credentials') as mock_refresh:
+            credentials = await self.oauth_manager.load_credentials()
+            mock_refresh.assert_not_awaited()
+            
+            # The refresh runs as its own task
+            self.assertIsNotNone(self.oauth_manager._refresh_task)
+            await self.oauth_manager._refresh_task
+        
+        self.assertEqual(credentials.token, 'test-token')
+        mock_refresh.assert_awaited_once()
+
+    async def test_load_credentials_unknown_expiry_refreshed_inline(self):
+        """Test a token of unknown age is refreshed once, before it is returned."""
+        stored = self._stored_credentials(timedelta(hours=1))
+        stored['expiry'] = None
+        self.credential_manager_mock.get_credentials.return_value = stored
+        
+        with patch.object(self.oauth_manager, '_refresh_credentials') as mock_refresh:
+            await self.oauth_manager.load_credentials()
+        
+        mock_refresh.assert_awaited_once()
+        self.assertIsNone(self.oauth_manager._refresh_task)
+
+    async def test_load_credentials_fresh_token(self):
+        """Test a token far from expiry is not refreshed."""
+        self.credential_manager_mock.get_credentials.return_value = self._stored_credentials(timedelta(hours=1))
+        
+        with patch.object(self.oauth_manager, '_refresh_credentials') as mock_refresh:
+            await self.oauth_manager.load_credentials()
+        
+        mock_refresh.assert_not_awaited()
+        self.assertIsNone(self.oauth_manager._refresh_task)
+
+    async def test_refresh_stores_rotated_refresh_token(self):
+        """Test a refresh persists a rotated refresh token with the new access token."""
+        self.credential_manager_mock.get_credentials.return_value = self._stored_credentials(timedelta(hours=1))
+        credentials = await self.oauth_manager.load_credentials()
+        new_expiry = datetime.utcnow() + timedelta(hours=2)
+        
+        async def call_token_endpoint(method):
+            credentials.token = 'new-token'
+            credentials._refresh_token = 'rotated-refresh-token'
+            credentials.expiry = new_expiry
+        
+        with patch.object(self.oauth_manager, '_call_token_endpoint', side_effect=call_token_endpoint):
+            await self.oauth_manager._refresh_credentials()
+        
+        self.credential_manager_mock.update_credentials.assert_called_once_with('google_oauth', {
+            'token': 'new-token',
+            'refresh_token': 'rotated-refresh-token',
+            'scopes': ['openid'],
+            'expiry': new_expiry.isoformat()
+        })
 
     @patch('googleapiclient.discovery.build')
     async def test_get_user_info(self, mock_build):
         """Test getting user information."""
         # Setup mocks
         mock_credentials = MagicMock()
-        self.credential_manager_mock.load_credentials.return_value = mock_credentials
+        self.oauth_manager._credentials = mock_credentials
         
         mock_service = MagicMock()
         mock_userinfo = MagicMock()
         mock_get = MagicMock()
-        mock_execute = AsyncMock()
-        mock_execute.return_value = {"email": "test@example.com", "name": "Test User"}
+        mock_get.execute.return_value = {"email": "test@example.com", "name": "Test User"}
         
         mock_service.userinfo.return_value = mock_userinfo
         mock_userinfo.get.return_value = mock_get
-        mock_get.execute = mock_execute
         
         mock_build.return_value = mock_service
         
         # Call method
         result = await self.oauth_manager.get_user_info()
         
-        # Assertions
+        # Assertions: the oauth2 client comes from the bundled discovery document
         self.assertEqual(result["email"], "test@example.com")
         self.assertEqual(result["name"], "Test User")
-        mock_build.assert_called_once_with('oauth2', 'v2', credentials=mock_credentials)
+        mock_build.assert_called_once_with(
+            'oauth2', 'v2', http=self.oauth_manager._authorized_http(), static_discovery=True
+        )
 
 
-class TestCredentialManager(unittest.TestCase):
+class TestCredentialManager(unittest.IsolatedAsyncioTestCase):
     """Test cases for CredentialManager class."""
 
-    def setUp(self):
-        """Set up test environment."""
-        # Create a temporary directory for credentials
-        self.test_dir = Path("test_credentials")
-        os.makedirs(self.test_dir, exist_ok=True)
-        
-        # Create test instance with test directory
-        with patch('src.auth.credential_manager.CredentialManager.ensure_storage_dir'):
-            with patch('src.auth.credential_manager.CredentialManager._generate_key'):
-                self.credential_manager = CredentialManager(credentials_dir=self.test_dir)
-                self.credential_manager._key = b'test_key_for_encryption_purposes_only=='
+    @classmethod
+    def setUpClass(cls):
+        """Create one credential store and encryption key for all tests."""
+        cls.test_dir = Path(tempfile.mkdtemp(prefix="test_credentials"))
+        cls.credential_manager = CredentialManager(storage_path=str(cls.test_dir))
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up after tests."""
         # Remove test directory and files
-        for file in self.test_dir.glob('*'):
-            file.unlink()
-        self.test_dir.rmdir()
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+
+    def setUp(self):
+        """Give each test its own service so tests don't share credentials."""
+        self.test_service = f"test-{uuid4()}"
 
     def test_ensure_storage_dir(self):
         """Test ensuring storage directory exists."""
-        test_path = self.test_dir / "subdir"
+        self.assertTrue(self.test_dir.is_dir())
         
         # Call method
-        with patch('pathlib.Path.mkdir') as mock_mkdir:
-            self.credential_manager.ensure_storage_dir(test_path)
-            mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+        with patch('os.makedirs') as mock_makedirs:
+            self.credential_manager._ensure_storage_directory()
+            mock_makedirs.assert_called_once_with(str(self.test_dir), exist_ok=True)
 
-    @patch('keyring.set_password')
-    @patch('keyring.get_password')
-    def test_generate_key(self, mock_get_password, mock_set_password):
+    def test_generate_key(self):
         """Test key generation and retrieval."""
-        # Setup mock
-        mock_get_password.return_value = None
-        
-        # Call method
-        with patch('cryptography.fernet.Fernet.generate_key') as mock_generate:
-            mock_generate.return_value = b'test_generated_key=='
-            key = self.credential_manager._generate_key()
+        # The key created with the store is persisted and reused
+        key = self.credential_manager._get_or_create_encryption_key()
         
         # Assertions
-        self.assertEqual(key, b'test_generated_key==')
-        mock_set_password.assert_called_once()
+        self.assertEqual(key, self.credential_manager._encryption_key)
+        self.assertTrue((self.test_dir / '.key').is_file())
 
     def test_encrypt_decrypt(self):
         """Test encryption and decryption."""
-        # Test data
-        test_data = {"token": "secret-token", "refresh_token": "refresh-secret"}
-        test_json = json.dumps(test_data)
+        # Test data: credentials are serialized straight to UTF-8 JSON bytes
+        test_data = {"token": "secret-token", "refresh_token": "refresh-secret", "name": "Zoë"}
+        test_json = json.dumps(test_data, ensure_ascii=False).encode('utf-8')
+        file_path = str(self.test_dir / f'{self.test_service}.cred')
         
         # Encrypt
-        encrypted = self.credential_manager._encrypt(test_json)
-        self.assertNotEqual(encrypted, test_json)
-        
-        # Decrypt
-        decrypted = self.credential_manager._decrypt(encrypted)
-        self.assertEqual(decrypted, test_json)
+        self.credential_manager._write_encrypted(file_path, test_json)
+        with open(file_path, 'rb') as f:
+            self.assertNotIn(b'secret-token', f.read())
         
-        # Verify original data can be recovered
-        recovered_data = json.loads(decrypted)
+        # Decrypt and verify original data can be recovered
+        recovered_data, _ = self.credential_manager._read_sync(file_path)
         self.assertEqual(recovered_data, test_data)
 
-    @patch('builtins.open', new_callable=mock_open)
-    def test_store_credentials(self, mock_file):
+    async def test_store_credentials(self):
         """Test storing credentials."""
-        # Test data
-        test_service = "google"
         test_credentials = {"token": "test-token"}
         
-        # Call method with patch for encrypt
-        with patch.object(self.credential_manager, '_encrypt', return_value=b'encrypted-data'):
-            result = self.credential_manager.store_credentials(test_service, test_credentials)
+        # Call method
+        result = await self.credential_manager.store_credentials(self.test_service, test_credentials)
         
         # Assertions
         self.assertTrue(result)
-        mock_file.assert_called_once()
-        mock_file().write.assert_called_once_with(b'encrypted-data')
-
-    @patch('builtins.open', new_callable=mock_open, read_data=b'encrypted-data')
-    @patch('os.path.exists')
-    def test_load_credentials(self, mock_exists, mock_file):
+        file_path = self.credential_manager._get_credential_file_path(self.test_service)
+        with open(file_path, 'rb') as f:
+            self.assertNotIn(b'test-token', f.read())
+
+    def test_store_credentials_persists_across_event_loops(self):
+        """Test stored credentials survive the event loop closing."""
+        test_credentials = {"token": "test-token", "refresh_token": "refresh-token"}
+        
+        # Store on a short-lived loop, as the auth scripts do
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(
+                self.credential_manager.store_credentials(self.test_service, test_credentials)
+            )
+        finally:
+            loop.close()
+        self.assertTrue(result)
+        
+        # A fresh manager on the same directory reads them back
+        fresh_manager = CredentialManager(storage_path=str(self.test_dir))
+        loaded = asyncio.run(fresh_manager.get_credentials(self.test_service))
+        self.assertEqual(loaded, test_credentials)
+
+    async def test_index_merges_writes_from_other_managers(self):
+        """Test services stored through separate managers are all listed."""
+        other_manager = CredentialManager(storage_path=str(self.test_dir))
+        other_service = f"{self.test_service}-other"
+        
+        # Both managers load the index before either one writes
+        await self.credential_manager.store_credentials(self.test_service, {"token": "a"})
+        await other_manager.store_credentials(other_service, {"token": "b"})
+        
+        # A fresh manager sees both services
+        fresh_manager = CredentialManager(storage_path=str(self.test_dir))
+        services = await fresh_manager.list_stored_services()
+        self.assertIn(self.test_service, services)
+        self.assertIn(other_service, services)
+        
+        # Deleting through one manager is seen by the others
+        await other_manager.delete_credentials(self.test_service)
+        self.assertNotIn(self.test_service, await self.credential_manager.list_stored_services())
+
+    async def test_concurrent_writers_use_separate_temp_files(self):
+        """Test managers writing the same service at once don't clobber each other."""
+        other_manager = CredentialManager(storage_path=str(self.test_dir))
+        
+        results = await asyncio.gather(*(
+            manager.store_credentials(self.test_service, {"token": token})
+            for manager, token in ((self.credential_manager, "a"), (other_manager, "b"))
+            for _ in range(5)
+        ))
+        
+        self.assertTrue(all(results))
+        self.assertEqual(list(self.test_dir.glob("*.tmp")), [])
+        fresh_manager = CredentialManager(storage_path=str(self.test_dir))
+        self.assertIn(await fresh_manager.get_credentials(self.test_service), ({"token": "a"}, {"token": "b"}))
+
+    async def test_load_credentials(self):
         """Test loading credentials."""
-        # Setup mocks
-        mock_exists.return_value = True
-        test_service = "google"
         test_credentials = {"token": "test-token"}
+        await self.credential_manager.store_credentials(self.test_service, test_credentials)
         
-        # Call method with patch for decrypt
-        with patch.object(self.credential_manager, '_decrypt', return_value=json.dumps(test_credentials)):
-            result = self.credential_manager.load_credentials(test_service)
+        # Call method
+        result = await self.credential_manager.get_credentials(self.test_service)
         
         # Assertions
         self.assertEqual(result, test_credentials)
-        mock_file.assert_called_once()
+        self.assertIsNone(await self.credential_manager.get_credentials(f"{self.test_service}-missing"))
 
-    @patch('os.path.exists')
-    @patch('os.remove')
-    def test_delete_credentials(self, mock_remove, mock_exists):
+    async def test_delete_credentials(self):
         """Test deleting credentials."""
-        # Setup mocks
-        mock_exists.return_value = True
-        test_service = "google"
+        await self.credential_manager.store_credentials(self.test_service, {"token": "test-token"})
         
         # Call method
-        result = self.credential_manager.delete_credentials(test_service)
+        result = await self.credential_manager.delete_credentials(self.test_service)
         
         # Assertions
         self.assertTrue(result)
-        mock_remove.assert_called_once()
+        self.assertIsNone(await self.credential_manager.get_credentials(self.test_service))
 
-    @patch('os.path.exists')
-    def test_is_authenticated(self, mock_exists):
+    async def test_is_authenticated(self):
         """Test checking authentication status."""
-        # Setup mocks
-        test_service = "google"
+        # Test when credentials don't exist
+        self.assertFalse(self.credential_manager.is_service_authenticated(self.test_service))
         
         # Test when credentials exist
-        mock_exists.return_value = True
-        result = self.credential_manager.is_authenticated(test_service)
-        self.assertTrue(result)
+        await self.credential_manager.store_credentials(self.test_service, {"token": "test-token"})
+        self.assertTrue(self.credential_manager.is_service_authenticated(self.test_service))
         
-        # Test when credentials don't exist
-        mock_exists.return_value = False
-        result = self.credential_manager.is_authenticated(test_service)
-        self.assertFalse(result)
-
-
-def run_async_test(coro):
-    """Run an async test coroutine."""
-    return asyncio.run(coro)
+        # Test when another manager removed them
+        other_manager = CredentialManager(storage_path=str(self.test_dir))
+        await other_manager.delete_credentials(self.test_service)
+        self.assertFalse(self.credential_manager.is_service_authenticated(self.test_service))
 
 
 if __name__ == "__main__":
@@ -45,17 +45,8 @@ class GoogleWorkspaceFunctions:
                         "User is not authenticated with Google OAuth"
                     )
 
-                fetcher = {
-                    "tasks": self.oauth_manager.get_tasks_service,
-                    "calendar": self.oauth_manager.get_calendar_service,
-                    "drive": self.oauth_manager.get_drive_service,
-                    "docs": self.oauth_manager.get_docs_service,
-                }.get(service_name)
-
-                if fetcher is None:
-                    raise ValueError(f"Unknown service: {service_name}")
-
-                self._services[service_name] = await fetcher()
+                # Raises ValueError for an unknown service name
+                self._services[service_name] = await self.oauth_manager.service(service_name)
                 logger.info(f"✅  {service_name} service initialised")
 
             except Exception as exc: